@@ -1,13 +1,35 @@
 import os
 import csv
-from flask import Flask, send_from_directory, request
+import json
+import hashlib
+import hmac
+from flask import Flask, send_file, request
 from flask_cors import CORS
 import sys
+import numpy as np
 
 # Add the models directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'models'))
 
-from mw_job_predictor import predict_jobs_from_mw
+from mw_job_predictor import predict_jobs_from_mw, add_observation, sweep_jobs_from_mw, load_stats
+from compact_models import load_compact_models, sweep_linear_regression, predict_linear_regression, predict_prophet, year_end_dates
+from uncertainty import uncertainty_summary
+from aggregates import build_cube, query_cube
+from downsampling import build_resolutions, trend_series, MIN_POINTS
+from time_index import build_time_index
+from shared_cache import cache_key, get_json, set_json
+from regional_store import build_store, filter_years, ALL_TECHNOLOGIES
+from static_assets import build_static_index, choose_encoding
+from warmup import start_warmup, readiness, expect_ok
+from serialization import use_numpy_json
+
+# Longest year range a single trajectory request may cover
+MAX_TRAJECTORY_YEARS = 100
+# Upper bound on grid cells a single sweep request may evaluate
+MAX_SWEEP_CELLS = 2_000_000
+# Online MW observations change the served model, so posting one needs this
+# token in X-Admin-Token; the endpoint is disabled while it is unset
+OBSERVATIONS_TOKEN = os.environ.get('MW_OBSERVATIONS_TOKEN')
 
 # Load data from CSV using csv module
 def load_data(data_path):
@@ -63,15 +85,43 @@ def load_data(data_path):
 
     return data
 
-data_path = os.path.join(os.path.dirname(__file__), 'data', 'jobs_data.csv')
+data_path = os.environ.get('JOBS_DATA_PATH', os.path.join(os.path.dirname(__file__), 'data', 'jobs_data.csv'))
 SAMPLE_DATA = load_data(data_path)
+# Trend series downsampled per sector at the standard resolutions
+DOWNSAMPLED = build_resolutions(SAMPLE_DATA['data'])
+# Year-sorted arrays per sector for from_year/to_year slices
+TIME_INDEX = build_time_index(SAMPLE_DATA['data'])
 
 app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+use_numpy_json(app)
 app.config['SECRET_KEY'] = 'asdf#FGSgvasgf$5$WGT'
 
 # Enable CORS for all routes
 CORS(app)
 
+# Built frontend, indexed once at startup and served from memory
+STATIC_INDEX = build_static_index(app.static_folder)
+
+def linear_extrapolation(sector_data, years):
+    """
+    Closed-form growth extrapolation from the last two actual data points,
+    evaluated for any number of target years at once
+    """
+    actual_jobs = sector_data['actual_jobs']
+    latest_year = sector_data['years'][-1]
+    latest_actual_jobs = actual_jobs[-1]
+
+    growth_rate_per_year = 0
+    if len(actual_jobs) >= 2 and actual_jobs[-2] != 0:
+        growth_rate_per_year = (latest_actual_jobs - actual_jobs[-2]) / actual_jobs[-2]
+
+    # Past or current years return the latest actual value
+    years = np.asarray(years)
+    predicted = np.where(years > latest_year,
+                         latest_actual_jobs * (1 + growth_rate_per_year * (years - latest_year)),
+                         latest_actual_jobs)
+    return predicted.astype(np.int64), latest_year, growth_rate_per_year
+
 @app.route('/api/jobs/sectors')
 def get_sectors():
     return {'sectors': SAMPLE_DATA['sectors']}
@@ -83,39 +133,127 @@ def get_years():
 @app.route('/api/jobs/trends')
 def get_trends():
     sector = request.args.get('sector')
+    max_points = request.args.get('max_points', type=int)
+    if max_points is not None and max_points < MIN_POINTS:
+        return {'error': f'max_points must be at least {MIN_POINTS}'}, 400
+    from_year = request.args.get('from_year', type=int)
+    to_year = request.args.get('to_year', type=int)
+    if from_year is not None and to_year is not None and from_year > to_year:
+        return {'error': 'from_year must not be after to_year'}, 400
     if sector and sector in SAMPLE_DATA['data']:
-        return SAMPLE_DATA['data'][sector]
+        if from_year is None and to_year is None:
+            return trend_series(SAMPLE_DATA['data'][sector], DOWNSAMPLED[sector], max_points)
+        # A range is sliced from the index and downsampled on the fly
+        return trend_series(TIME_INDEX[sector].between(from_year, to_year), {}, max_points)
     return {'error': 'Sector not found'}, 404
 
+def compute_insights(sector_data):
+    estimated_jobs = sector_data['estimated_jobs']
+    actual_jobs = sector_data['actual_jobs']
+    years = sector_data['years']
+
+    total_growth_percentage = ((actual_jobs[-1] - actual_jobs[0]) / actual_jobs[0]) * 100 if actual_jobs[0] != 0 else 0
+    
+    # Calculate accuracy as percentage of correct predictions (inverse of error rate)
+    # Use Mean Absolute Percentage Error (MAPE) for better accuracy representation
+    mape = sum([abs((e - a) / a) * 100 for e, a in zip(estimated_jobs, actual_jobs) if a != 0]) / len([a for a in actual_jobs if a != 0]) if actual_jobs else 0
+    accuracy_percentage = max(0, 100 - mape)  # Ensure accuracy doesn't go negative
+    
+    # Also calculate average absolute deviation for reference
+    average_estimation_deviation = sum([abs(e - a) for e, a in zip(estimated_jobs, actual_jobs)]) / len(estimated_jobs) if estimated_jobs else 0
+
+    return {
+        'total_growth_percentage': round(total_growth_percentage, 2),
+        'latest_jobs': actual_jobs[-1],
+        'latest_capacity': sector_data['installed_capacity'][-1],
+        'average_estimation_deviation': round(average_estimation_deviation, 2),
+        'accuracy_percentage': round(accuracy_percentage, 2),
+        'years_of_data': len(years),
+        'latest_year': years[-1]
+    }
+
 @app.route('/api/jobs/insights')
 def get_insights():
     sector = request.args.get('sector')
     if sector and sector in SAMPLE_DATA['data']:
-        sector_data = SAMPLE_DATA['data'][sector]
-        estimated_jobs = sector_data['estimated_jobs']
-        actual_jobs = sector_data['actual_jobs']
-        years = sector_data['years']
+        return compute_insights(SAMPLE_DATA['data'][sector])
+    return {'error': 'Sector not found'}, 404
 
-        total_growth_percentage = ((actual_jobs[-1] - actual_jobs[0]) / actual_jobs[0]) * 100 if actual_jobs[0] != 0 else 0
-        
-        # Calculate accuracy as percentage of correct predictions (inverse of error rate)
-        # Use Mean Absolute Percentage Error (MAPE) for better accuracy representation
-        mape = sum([abs((e - a) / a) * 100 for e, a in zip(estimated_jobs, actual_jobs) if a != 0]) / len([a for a in actual_jobs if a != 0]) if actual_jobs else 0
-        accuracy_percentage = max(0, 100 - mape)  # Ensure accuracy doesn't go negative
-        
-        # Also calculate average absolute deviation for reference
-        average_estimation_deviation = sum([abs(e - a) for e, a in zip(estimated_jobs, actual_jobs)]) / len(estimated_jobs) if estimated_jobs else 0
+def build_bootstrap(data):
+    """
+    Serialise sectors, years, every trend series and every sector's insights
+    once per dataset. The version is a hash of the payload, so it changes
+    whenever the data does and doubles as the ETag.
+    """
+    payload = {
+        'sectors': data['sectors'],
+        'years': data['years'],
+        'trends': data['data'],
+        'insights': {sector: compute_insights(sector_data) for sector, sector_data in data['data'].items()}
+    }
+    version = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+    payload['version'] = version
+    return {'version': version, 'body': json.dumps(payload, separators=(',', ':'))}
 
-        return {
-            'total_growth_percentage': round(total_growth_percentage, 2),
-            'latest_jobs': actual_jobs[-1],
-            'latest_capacity': sector_data['installed_capacity'][-1],
-            'average_estimation_deviation': round(average_estimation_deviation, 2),
-            'accuracy_percentage': round(accuracy_percentage, 2),
-            'years_of_data': len(years),
-            'latest_year': years[-1]
-        }
-    return {'error': 'Sector not found'}, 404
+BOOTSTRAP = build_bootstrap(SAMPLE_DATA)
+CUBE = build_cube(SAMPLE_DATA)
+REGIONAL_STORE = build_store(SAMPLE_DATA, os.path.join(os.path.dirname(__file__), 'data', 'india_world_jobs.csv'))
+
+@app.route('/api/jobs/bootstrap')
+def get_bootstrap():
+    """Everything the dashboard needs for first paint in one cacheable response"""
+    response = app.response_class(BOOTSTRAP['body'], mimetype='application/json')
+    response.set_etag(BOOTSTRAP['version'])
+    response.cache_control.public = True
+    response.cache_control.max_age = 300
+    return response.make_conditional(request)
+
+@app.route('/api/jobs/aggregate')
+def get_aggregate():
+    """Group-by and filter queries answered from the Year x Sector rollups"""
+    group_by = request.args.get('group_by', '').split(',')
+    sectors = request.args.getlist('sector') or None
+    years = request.args.getlist('year', type=int) or None
+    from_year = request.args.get('from_year', type=int)
+    to_year = request.args.get('to_year', type=int)
+    if from_year is not None or to_year is not None:
+        years = [y for y in (years or CUBE['years'])
+                 if (from_year is None or y >= from_year) and (to_year is None or y <= to_year)]
+    metrics = [name for name in request.args.get('metrics', '').split(',') if name] or None
+
+    try:
+        return query_cube(CUBE, group_by, sectors, years, metrics)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+@app.route('/api/jobs/india-world/technologies')
+def get_india_world_technologies():
+    return {'technologies': [ALL_TECHNOLOGIES] + REGIONAL_STORE['technologies']}
+
+@app.route('/api/jobs/india-world')
+def get_india_world():
+    """India's jobs and share of world renewable jobs per FY for one technology"""
+    technology = request.args.get('technology', ALL_TECHNOLOGIES)
+    if technology not in REGIONAL_STORE['india_vs_world']:
+        return {'error': 'Technology not found'}, 404
+    rows = REGIONAL_STORE['india_vs_world'][technology]
+    return {
+        'technology': technology,
+        'rows': filter_years(rows, request.args.get('from_year', type=int), request.args.get('to_year', type=int))
+    }
+
+@app.route('/api/jobs/india-world/sectors')
+def get_sector_vs_world():
+    """Sector jobs data joined with the India-vs-World table on (sector, year)"""
+    sector = request.args.get('sector')
+    if sector not in REGIONAL_STORE['sector_vs_world']:
+        return {'error': 'No India-vs-World data for this sector'}, 404
+    joined = REGIONAL_STORE['sector_vs_world'][sector]
+    return {
+        'sector': sector,
+        'technology': joined['technology'],
+        'rows': filter_years(joined['rows'], request.args.get('from_year', type=int), request.args.get('to_year', type=int))
+    }
 
 @app.route('/api/jobs/predict', methods=['POST'])
 def predict_jobs():
@@ -125,36 +263,82 @@ def predict_jobs():
 
     if sector not in SAMPLE_DATA['data']:
         return {'error': 'Sector not found'}, 404
+    samples = data.get('samples')
+    if samples is not None and (not isinstance(samples, int) or isinstance(samples, bool) or samples < 1):
+        return {'error': 'samples must be a positive integer'}, 400
+    if not isinstance(year, int) or isinstance(year, bool):
+        return {'error': 'year must be an integer'}, 400
+    # The bootstrap simulates every year up to the target, so its horizon is bounded too
+    if data.get('uncertainty') and year - SAMPLE_DATA['data'][sector]['years'][-1] > MAX_TRAJECTORY_YEARS:
+        return {'error': f'Uncertainty bands reach at most {MAX_TRAJECTORY_YEARS} years past the data'}, 400
+
+    # Responses are shared across workers and keyed on the dataset version
+    key = cache_key(sector, year, bool(data.get('uncertainty')), samples)
+    cached = get_json('predict', BOOTSTRAP['version'], key)
+    if cached is not None:
+        return cached
 
     sector_data = SAMPLE_DATA['data'][sector]
-    latest_year = max(sector_data['years'])
-    latest_actual_jobs = sector_data['actual_jobs'][sector_data['years'].index(latest_year)]
-
-    # Simple linear extrapolation for prediction
-    # This is a placeholder, a real ML model would be more complex
-    if latest_year < year:
-        # Calculate growth rate based on the last two data points for a more recent trend
-        if len(sector_data['actual_jobs']) >= 2:
-            prev_year_jobs = sector_data['actual_jobs'][-2]
-            if prev_year_jobs != 0:
-                growth_rate_per_year = (latest_actual_jobs - prev_year_jobs) / prev_year_jobs
-            else:
-                growth_rate_per_year = 0
-        else:
-            growth_rate_per_year = 0 # Fallback if not enough data points
-
-        predicted_jobs = latest_actual_jobs * (1 + growth_rate_per_year * (year - latest_year))
-    else:
-        predicted_jobs = latest_actual_jobs # If predicting for a past or current year, return latest actual
+    predicted, latest_year, growth_rate_per_year = linear_extrapolation(sector_data, [year])
+    predicted_jobs = int(predicted[0])
+    if year <= latest_year:
+        growth_rate_per_year = 0
 
-    return {
+    response = {
         'sector': sector,
         'year': year,
-        'predicted_jobs': int(predicted_jobs),
+        'predicted_jobs': predicted_jobs,
         'growth_rate': round(growth_rate_per_year * 100, 2),
         'model_type': 'linear_extrapolation'
     }
 
+    if data.get('uncertainty'):
+        response['uncertainty'] = uncertainty_summary(sector, sector_data['actual_jobs'], year - latest_year, predicted_jobs, samples)
+    set_json('predict', BOOTSTRAP['version'], key, response)
+    return response
+
+@app.route('/api/jobs/trajectory', methods=['POST'])
+def predict_trajectory():
+    """Predict every year in a range for one or more sectors in a single call"""
+    data = request.json or {}
+    sectors = data.get('sectors') or ([data['sector']] if data.get('sector') else SAMPLE_DATA['sectors'])
+
+    try:
+        from_year = int(data['from_year'])
+        to_year = int(data['to_year'])
+    except (KeyError, TypeError, ValueError):
+        return {'error': 'from_year and to_year are required'}, 400
+    if not isinstance(sectors, list) or not all(isinstance(sector, str) for sector in sectors):
+        return {'error': 'sectors must be a list of sector names'}, 400
+    if to_year < from_year or to_year - from_year >= MAX_TRAJECTORY_YEARS:
+        return {'error': f'Year range must be ascending and at most {MAX_TRAJECTORY_YEARS} years'}, 400
+
+    unknown = [sector for sector in sectors if sector not in SAMPLE_DATA['data']]
+    if unknown:
+        return {'error': f'Sector not found: {", ".join(unknown)}'}, 404
+
+    key = cache_key(sectors, from_year, to_year)
+    cached = get_json('trajectory', BOOTSTRAP['version'], key)
+    if cached is not None:
+        return cached
+
+    years = np.arange(from_year, to_year + 1)
+    predictions = {}
+    growth_rates = {}
+    for sector in sectors:
+        predicted, _, growth_rate_per_year = linear_extrapolation(SAMPLE_DATA['data'][sector], years)
+        predictions[sector] = predicted.tolist()
+        growth_rates[sector] = round(growth_rate_per_year * 100, 2)
+
+    response = {
+        'years': years.tolist(),
+        'predictions': predictions,
+        'growth_rate': growth_rates,
+        'model_type': 'linear_extrapolation'
+    }
+    set_json('trajectory', BOOTSTRAP['version'], key, response)
+    return response
+
 @app.route('/api/jobs/predict-mw', methods=['POST'])
 def predict_jobs_by_mw():
     """
@@ -185,22 +369,164 @@ def predict_jobs_by_mw():
     except Exception as e:
         return {'error': f'Prediction failed: {str(e)}'}, 500
 
+@app.route('/api/jobs/predict-mw/observations', methods=['POST'])
+def add_mw_observation():
+    """
+    Incrementally refit the MW model for a sector with one new observation
+    """
+    if not OBSERVATIONS_TOKEN:
+        return {'error': 'Online observations are disabled'}, 403
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', '').encode(), OBSERVATIONS_TOKEN.encode()):
+        return {'error': 'A valid X-Admin-Token is required'}, 403
+
+    data = request.json
+    sector = data.get('sector')
+    mw_capacity = data.get('mw_capacity')
+    actual_jobs = data.get('actual_jobs')
+
+    if not sector or mw_capacity is None or actual_jobs is None:
+        return {'error': 'Sector, MW capacity and actual jobs are required'}, 400
+
+    try:
+        return add_observation(sector, float(mw_capacity), float(actual_jobs)), 201
+    except (TypeError, ValueError) as e:
+        return {'error': f'Invalid observation: {str(e)}'}, 400
+
+def parse_range(spec, name):
+    """Accept either an explicit list or an inclusive {start, stop, step} range"""
+    if isinstance(spec, list):
+        values = np.asarray(spec, dtype=float)
+        if values.ndim != 1 or not np.isfinite(values).all():
+            raise ValueError(f'{name} must be a flat list of finite numbers')
+        return values
+    start = float(spec['start'])
+    stop = float(spec['stop'])
+    step = float(spec.get('step', 1))
+    if not np.isfinite([start, stop, step]).all():
+        raise ValueError(f'{name} needs finite start, stop and step')
+    if step <= 0 or stop < start:
+        raise ValueError(f'{name} needs start <= stop and a positive step')
+    # Checked as a float first, so a tiny step cannot overflow the integer count
+    count = np.floor((stop - start) / step + 1e-9) + 1
+    if not count <= MAX_SWEEP_CELLS:
+        raise ValueError(f'{name} has too many points (max {MAX_SWEEP_CELLS})')
+    return start + step * np.arange(int(count))
+
+@app.route('/api/jobs/sweep', methods=['POST'])
+def sweep_jobs():
+    """
+    Evaluate a whole sector x (year x) MW scenario grid in one vectorised pass
+    """
+    data = request.json or {}
+    sectors = data.get('sectors') or SAMPLE_DATA['sectors']
+    model_type = data.get('model_type', 'linear_regression_mw')
+
+    if not isinstance(sectors, list) or not all(isinstance(sector, str) for sector in sectors):
+        return {'error': 'sectors must be a list of sector names'}, 400
+    unknown = [sector for sector in sectors if sector not in SAMPLE_DATA['data']]
+    if unknown:
+        return {'error': f'Sector not found: {", ".join(unknown)}'}, 404
+    if 'mw_capacity' not in data:
+        return {'error': 'MW capacity range is required'}, 400
+
+    try:
+        mw_capacity = parse_range(data['mw_capacity'], 'mw_capacity')
+        years = parse_range(data['years'], 'years').astype(int) if model_type == 'linear_regression' else None
+    except (KeyError, TypeError, ValueError) as e:
+        return {'error': f'Invalid range: {str(e)}'}, 400
+
+    cells = len(sectors) * len(mw_capacity) * (len(years) if years is not None else 1)
+    if cells > MAX_SWEEP_CELLS:
+        return {'error': f'Sweep too large: {cells} points (max {MAX_SWEEP_CELLS})'}, 400
+
+    if model_type == 'linear_regression_mw':
+        predicted_jobs = sweep_jobs_from_mw(mw_capacity, sectors)
+        if predicted_jobs is None:
+            return {'error': 'Unable to predict jobs for these sectors'}, 500
+        axes = ['sector', 'mw_capacity']
+    elif model_type == 'linear_regression':
+        params = load_compact_models()['linear_regression']
+        # Clamped at zero like the MW grid
+        predicted_jobs = np.maximum(sweep_linear_regression(params, sectors, years, mw_capacity), 0).astype(np.int64)
+        axes = ['sector', 'year', 'mw_capacity']
+    else:
+        return {'error': 'Invalid model type'}, 400
+
+    response = {
+        'model_type': model_type,
+        'axes': axes,
+        'sectors': sectors,
+        'mw_capacity': mw_capacity.tolist(),
+        'predicted_jobs': predicted_jobs.tolist()
+    }
+    if years is not None:
+        response['years'] = years.tolist()
+    return response
+
 @app.route('/', defaults={'path': ''}) 
 @app.route('/<path:path>')
 def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
+    if app.static_folder is None:
             return "Static folder not configured", 404
 
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
-        else:
+    # Unknown paths fall back to index.html for client-side routing
+    entry = STATIC_INDEX.get(path) if path != "" else None
+    if entry is None:
+        entry = STATIC_INDEX.get('index.html')
+        if entry is None:
             return "index.html not found", 404
 
+    if 'file' in entry:
+        return send_file(entry['file'], mimetype=entry['mimetype'], conditional=True)
+
+    encoding = choose_encoding(entry, request.accept_encodings)
+    response = app.response_class(entry['variants'][encoding] if encoding else entry['body'], mimetype=entry['mimetype'])
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if entry['variants']:
+        response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = entry['cache_control']
+    response.set_etag(f"{entry['etag']}-{encoding}" if encoding else entry['etag'])
+    return response.make_conditional(request)
+
+@app.route('/api/ready')
+def get_readiness():
+    """503 until the warm-up has loaded models and filled caches"""
+    return readiness()
+
+def warm_models():
+    models = load_compact_models()
+    load_stats()
+    return {'prophet_sectors': len(models['prophet'])}
+
+def warm_predictions():
+    """One prediction per sector and model, plus the cached /predict responses"""
+    models = load_compact_models()
+    client = app.test_client()
+    for sector in SAMPLE_DATA['sectors']:
+        sector_data = SAMPLE_DATA['data'][sector]
+        next_year = sector_data['years'][-1] + 1
+        capacity = sector_data['installed_capacity'][-1]
+        predict_jobs_from_mw(capacity, sector)
+        if models['linear_regression']:
+            predict_linear_regression(models['linear_regression'], next_year, capacity, sector)
+        if sector in models['prophet']:
+            predict_prophet(models['prophet'][sector], year_end_dates(next_year), {'Installed_Capacity_MW': capacity})
+        for uncertainty in (False, True):
+            expect_ok(client.post('/api/jobs/predict', json={'sector': sector, 'year': next_year, 'uncertainty': uncertainty}), '/api/jobs/predict')
+    return {'sectors': len(SAMPLE_DATA['sectors'])}
+
+def warm_responses():
+    client = app.test_client()
+    for path in ('/api/jobs/bootstrap', '/api/jobs/sectors', '/api/jobs/years', '/api/jobs/aggregate'):
+        expect_ok(client.get(path), path)
+    for sector in SAMPLE_DATA['sectors']:
+        expect_ok(client.get('/api/jobs/insights', query_string={'sector': sector}), '/api/jobs/insights')
+        expect_ok(client.get('/api/jobs/trends', query_string={'sector': sector}), '/api/jobs/trends')
+    return {'sectors': len(SAMPLE_DATA['sectors'])}
+
+start_warmup([('models', warm_models), ('predictions', warm_predictions), ('responses', warm_responses)])
+
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", 5000))  # default 5000 if not set 
     app.run(host='0.0.0.0', port=port, debug=True)
@@ -0,0 +1,176 @@
+import os
+import hmac
+import time
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Cost-aware admission control. Every client has a token bucket refilled at
+# ADMISSION_RATE tokens per second up to ADMISSION_BURST, and each request
+# spends its cost weight. On top of that, heavy inference (Prophet) needs one
+# of MAX_HEAVY_INFERENCE slots shared by every worker on the host and waits at
+# most HEAVY_WAIT_SECONDS for one. Callers that are refused degrade to a cached or cheaper-model
+# answer instead of queueing, so a burst of heavy requests cannot starve the
+# cheap endpoints.
+ADMISSION_RATE = float(os.environ.get('ADMISSION_RATE', 20))
+ADMISSION_BURST = float(os.environ.get('ADMISSION_BURST', 40))
+MAX_HEAVY_INFERENCE = int(os.environ.get('MAX_HEAVY_INFERENCE', 2))
+HEAVY_WAIT_SECONDS = float(os.environ.get('HEAVY_WAIT_SECONDS', 0.05))
+# Slot i is a lock on byte i of this file, so the budget holds across worker
+# processes and a worker that dies frees its slots with it
+HEAVY_SLOTS_PATH = os.environ.get('HEAVY_SLOTS_PATH', os.path.join(tempfile.gettempdir(), f'renewable-jobs-heavy-{os.getuid() if hasattr(os, "getuid") else 0}.lock'))
+SLOT_POLL_SECONDS = 0.005
+# Buckets kept for at most this many clients, least recently seen evicted first
+MAX_CLIENTS = 10000
+# Clients are keyed on their address. Behind proxies, set TRUSTED_PROXY_HOPS to
+# the number of proxies that append to X-Forwarded-For so the address is taken
+# from the hop the nearest trusted proxy saw, never from the client's own entry.
+TRUSTED_PROXY_HOPS = int(os.environ.get('TRUSTED_PROXY_HOPS', 0))
+# Issued API keys (comma-separated); a key gets its own bucket only if it is one of these
+API_KEYS = frozenset(key.strip() for key in os.environ.get('ADMISSION_API_KEYS', '').split(',') if key.strip())
+
+COSTS = {
+    'metadata': 0.1,
+    'linear_regression': 1,
+    'prophet': 8
+}
+HEAVY_MODELS = {'prophet'}
+
+_buckets = OrderedDict()
+_buckets_lock = threading.Lock()
+_slots = None
+_slots_pid = None
+_slots_lock = threading.Lock()
+
+class InferenceSlots:
+    """
+    A fixed number of slots, shared through byte-range locks on a file when
+    one is given. Record locks belong to the process, so each slot also has a
+    thread lock to keep two threads of one worker from both taking it.
+    """
+
+    def __init__(self, count, path=None):
+        self.locals = [threading.Lock() for _ in range(count)]
+        self.fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600) if path and fcntl is not None else None
+
+    def try_acquire(self):
+        """The index of a free slot, now held, or None"""
+        for slot, lock in enumerate(self.locals):
+            if not lock.acquire(blocking=False):
+                continue
+            if self.fd is None:
+                return slot
+            try:
+                fcntl.lockf(self.fd, fcntl.LOCK_EX | fcntl.LOCK_NB, 1, slot)
+                return slot
+            except OSError:
+                lock.release()
+        return None
+
+    def release(self, slot):
+        if self.fd is not None:
+            fcntl.lockf(self.fd, fcntl.LOCK_UN, 1, slot)
+        self.locals[slot].release()
+
+def heavy_slots():
+    """The host-wide heavy-inference slots, reopened after a fork"""
+    global _slots, _slots_pid
+    with _slots_lock:
+        if _slots is None or _slots_pid != os.getpid():
+            try:
+                _slots = InferenceSlots(MAX_HEAVY_INFERENCE, HEAVY_SLOTS_PATH)
+            except OSError as e:
+                print(f"Shared inference slots unavailable ({e}), limiting heavy inference per worker")
+                _slots = InferenceSlots(MAX_HEAVY_INFERENCE)
+            _slots_pid = os.getpid()
+        return _slots
+
+def trust_proxies(app, hops=TRUSTED_PROXY_HOPS):
+    """Resolve request.remote_addr through `hops` trusted proxies"""
+    if hops:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops)
+    return app
+
+def valid_api_key(api_key):
+    return any(hmac.compare_digest(api_key, key) for key in API_KEYS)
+
+def client_id(request):
+    """A validated API key, otherwise the client address (see trust_proxies)"""
+    api_key = request.headers.get('X-API-Key')
+    if api_key and valid_api_key(api_key):
+        return f'key:{api_key}'
+    return request.remote_addr or 'unknown'
+
+def capped(cost, burst=ADMISSION_BURST):
+    """A cost no larger than a full bucket, so every request can eventually be admitted"""
+    return min(cost, burst)
+
+def refund(client, tokens, burst=ADMISSION_BURST):
+    """Give back tokens charged for work that was not done"""
+    with _buckets_lock:
+        if client in _buckets:
+            available, updated = _buckets[client]
+            _buckets[client] = (min(burst, available + tokens), updated)
+
+def admit(client, cost, rate=ADMISSION_RATE, burst=ADMISSION_BURST):
+    """Spend `cost` tokens from the client's bucket; False if it cannot afford it"""
+    now = time.monotonic()
+    with _buckets_lock:
+        tokens, updated = _buckets.pop(client, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        admitted = tokens >= cost
+        if admitted:
+            tokens -= cost
+        _buckets[client] = (tokens, now)
+        while len(_buckets) > MAX_CLIENTS:
+            _buckets.popitem(last=False)
+    return admitted
+
+def retry_after(cost, rate=ADMISSION_RATE):
+    """Seconds until an empty bucket can afford `cost`, for the Retry-After header"""
+    return max(1, int(capped(cost) / rate + 0.999))
+
+@contextmanager
+def heavy_slot(timeout=HEAVY_WAIT_SECONDS):
+    """Yield True while holding a heavy-inference slot, or False if none freed up in time"""
+    slots = heavy_slots()
+    deadline = time.monotonic() + timeout
+    slot = slots.try_acquire()
+    while slot is None and time.monotonic() < deadline:
+        time.sleep(SLOT_POLL_SECONDS)
+        slot = slots.try_acquire()
+    try:
+        yield slot is not None
+    finally:
+        if slot is not None:
+            slots.release(slot)
+
+@contextmanager
+def inference_budget(client, model_type, units=1, fallback='linear_regression'):
+    """
+    Yield (model to run, degraded reason) for an inference request of `units`
+    predictions. Heavy models need both the client's tokens and a free slot;
+    without either the request degrades to `fallback`, charged at its own
+    cost. Model None means the client cannot afford even the fallback and
+    should get a 429. Costs are capped at a full bucket.
+    """
+    if model_type not in HEAVY_MODELS:
+        yield (model_type if admit(client, capped(COSTS.get(model_type, 1) * units)) else None), None
+        return
+    cost = capped(COSTS[model_type] * units)
+    fallback_cost = capped(COSTS[fallback] * units)
+    if not admit(client, cost):
+        yield (fallback if admit(client, fallback_cost) else None), 'rate_limited'
+        return
+    with heavy_slot() as acquired:
+        if not acquired:
+            refund(client, cost - fallback_cost)
+        yield (model_type, None) if acquired else (fallback, 'busy')
@@ -0,0 +1,208 @@
+import os
+import json
+import time
+import argparse
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_preprocessor import preprocess_data
+from training_pipeline import COLUMNS, DEFAULT_DATA_PATH, regression_metrics, fit_prophet, fit_mw_regression, fit_linear_regression
+from compact_models import (export_prophet, export_linear_regression, as_arrays, PROPHET_ARRAYS, LINEAR_REGRESSION_ARRAYS,
+                            predict_prophet, predict_linear_regression, year_end_dates)
+
+# Rolling-origin backtest of every job predictor. For each cut-off year the
+# models are refitted on the data up to and including that year and asked for
+# the following `horizon` years. Every (model, cut-off) pair runs as one task
+# on a process pool and reports its errors, fit time, per-prediction latency
+# and peak Python memory.
+#
+# Predictions use the target year's actual installed capacity, the way API
+# callers pass planned capacity. Latency is measured on the path the API
+# serves: closed-form coefficients for the MW regression and the compact NumPy
+# evaluators for the pooled regression and Prophet.
+MIN_TRAIN_YEARS = 3
+DEFAULT_HORIZON = 1
+
+def fit_growth_extrapolation(train):
+    """The two-point growth extrapolation behind /api/jobs/predict"""
+    latest = {}
+    for sector, sector_df in train.groupby('Sector'):
+        sector_df = sector_df.sort_values('Year')
+        actual_jobs = sector_df['Actual_Jobs'].to_numpy(dtype=float)
+        growth = (actual_jobs[-1] - actual_jobs[-2]) / actual_jobs[-2] if len(actual_jobs) >= 2 and actual_jobs[-2] != 0 else 0
+        latest[sector] = (int(sector_df['Year'].iloc[-1]), actual_jobs[-1], growth)
+
+    def predict(sector, year, capacity):
+        latest_year, latest_jobs, growth = latest[sector]
+        return int(latest_jobs * (1 + growth * (year - latest_year))) if year > latest_year else int(latest_jobs)
+    return predict
+
+def fit_jobs_per_mw(train):
+    """The average jobs/MW ratio behind backend_final's /api/jobs/predict-mw"""
+    totals = train.groupby('Sector')[['Actual_Jobs', 'Installed_Capacity_MW']].sum()
+    ratios = {sector: row['Actual_Jobs'] / row['Installed_Capacity_MW']
+              for sector, row in totals.iterrows() if row['Installed_Capacity_MW'] != 0}
+
+    def predict(sector, year, capacity):
+        # No capacity up to the cut-off: like /predict-mw, there is no answer
+        if sector not in ratios:
+            return None
+        return max(0, int(capacity * ratios[sector]))
+    return predict
+
+def fit_mw_predictor(train):
+    """Per-sector MW regression (mw_job_predictors.pkl / mw_job_stats.json)"""
+    coefficients = {}
+    for sector, sector_df in train.groupby('Sector'):
+        model, _ = fit_mw_regression(sector_df)
+        coefficients[sector] = (float(model.coef_[0]), float(model.intercept_))
+
+    def predict(sector, year, capacity):
+        slope, intercept = coefficients[sector]
+        return max(0, int(intercept + slope * capacity))
+    return predict
+
+def fit_pooled_regression(train):
+    """Pooled regression on year, capacity and sector (linear_regression_model.pkl)"""
+    model, _ = fit_linear_regression(train)
+    params = as_arrays(export_linear_regression(model), LINEAR_REGRESSION_ARRAYS)
+
+    def predict(sector, year, capacity):
+        return int(predict_linear_regression(params, year, capacity, sector)[0])
+    return predict
+
+def fit_prophet_models(train):
+    """Per-sector Prophet with installed capacity as a regressor (prophet_models.pkl)"""
+    params = {}
+    for sector, sector_df in train.groupby('Sector'):
+        model, _ = fit_prophet(sector_df.sort_values('Year'))
+        params[sector] = as_arrays(export_prophet(model), PROPHET_ARRAYS)
+
+    def predict(sector, year, capacity):
+        return int(predict_prophet(params[sector], year_end_dates(year), {'Installed_Capacity_MW': capacity})[0])
+    return predict
+
+FITTERS = {
+    'growth_extrapolation': fit_growth_extrapolation,
+    'jobs_per_mw': fit_jobs_per_mw,
+    'mw_regression': fit_mw_predictor,
+    'linear_regression': fit_pooled_regression,
+    'prophet': fit_prophet_models
+}
+
+def preload(kinds):
+    """Import the model libraries up front so fit time and memory exclude them"""
+    if {'mw_regression', 'linear_regression'} & set(kinds):
+        import sklearn.linear_model
+    if 'prophet' in kinds:
+        import prophet
+
+def backtest_task(kind, cutoff, horizon, records):
+    """Refit one model on data up to `cutoff` and score it on the next `horizon` years"""
+    df = pd.DataFrame.from_records(records)
+    train = df[df['Year'] <= cutoff]
+    test = df[(df['Year'] > cutoff) & (df['Year'] <= cutoff + horizon)]
+    test = test[test['Sector'].isin(set(train['Sector']))]
+    cases = list(zip(test['Sector'], test['Year'].astype(int), test['Installed_Capacity_MW'].astype(float), test['Actual_Jobs'].astype(float)))
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    predict = FITTERS[kind](train)
+    fit_seconds = time.perf_counter() - started
+    predicted = [predict(sector, year, capacity) for sector, year, capacity, _ in cases]
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Time predictions again without tracing, which would inflate them
+    latencies = []
+    for sector, year, capacity, _ in cases:
+        started = time.perf_counter()
+        predict(sector, year, capacity)
+        latencies.append(time.perf_counter() - started)
+
+    return {
+        'model': kind,
+        'cutoff': int(cutoff),
+        'fit_seconds': round(fit_seconds, 4),
+        'peak_memory_kb': round(peak_bytes / 1024, 1),
+        'predictions': [
+            {'sector': sector, 'year': year, 'actual': actual, 'predicted': value, 'latency_us': round(latency * 1e6, 2)}
+            for (sector, year, _, actual), value, latency in zip(cases, predicted, latencies)
+            if value is not None
+        ]
+    }
+
+def summarise(results):
+    """Per-model and per-(model, sector) error, latency, fit time and memory"""
+    summary = {}
+    for kind in sorted({result['model'] for result in results}):
+        model_results = [result for result in results if result['model'] == kind]
+        predictions = [p for result in model_results for p in result['predictions']]
+        if not predictions:
+            continue
+        latencies = np.array([p['latency_us'] for p in predictions])
+        entry = regression_metrics([p['actual'] for p in predictions], [p['predicted'] for p in predictions])
+        entry.update({
+            'cutoffs': len(model_results),
+            'fit_seconds_mean': round(float(np.mean([r['fit_seconds'] for r in model_results])), 4),
+            'latency_us_p50': round(float(np.percentile(latencies, 50)), 2),
+            'latency_us_p95': round(float(np.percentile(latencies, 95)), 2),
+            'peak_memory_kb': max(r['peak_memory_kb'] for r in model_results),
+            'sectors': {}
+        })
+        for sector in sorted({p['sector'] for p in predictions}):
+            sector_predictions = [p for p in predictions if p['sector'] == sector]
+            metrics = regression_metrics([p['actual'] for p in sector_predictions], [p['predicted'] for p in sector_predictions])
+            entry['sectors'][sector] = {'mae': metrics['mae'], 'mape': metrics['mape'], 'n_samples': metrics['n_samples']}
+        summary[kind] = entry
+    return summary
+
+def cheapest_within(summary, max_mape):
+    """Fastest model (median latency) whose MAPE meets the accuracy bar"""
+    eligible = [kind for kind, entry in summary.items() if entry['mape'] is not None and entry['mape'] <= max_mape]
+    return min(eligible, key=lambda kind: summary[kind]['latency_us_p50']) if eligible else None
+
+def run_backtest(data_path=DEFAULT_DATA_PATH, kinds=tuple(FITTERS), horizon=DEFAULT_HORIZON,
+                 min_train_years=MIN_TRAIN_YEARS, workers=None):
+    df = preprocess_data(data_path)
+    records = df[COLUMNS].to_dict('records')
+    years = sorted(df['Year'].astype(int).unique())
+    cutoffs = years[min_train_years - 1:-1]
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=preload, initargs=(tuple(kinds),)) as executor:
+        futures = [executor.submit(backtest_task, kind, cutoff, horizon, records) for kind in kinds for cutoff in cutoffs]
+        results = [future.result() for future in futures]
+    return {
+        'data': os.path.basename(data_path),
+        'horizon': horizon,
+        'cutoffs': [int(cutoff) for cutoff in cutoffs],
+        'summary': summarise(results),
+        'results': results
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Rolling-origin backtest of the job prediction models')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help='CSV with the jobs data')
+    parser.add_argument('--models', nargs='+', choices=list(FITTERS), default=list(FITTERS), help='Models to compare')
+    parser.add_argument('--horizon', type=int, default=DEFAULT_HORIZON, help='Years ahead of each cut-off to predict')
+    parser.add_argument('--min-train-years', type=int, default=MIN_TRAIN_YEARS, help='Years of history before the first cut-off')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (defaults to CPU count)')
+    parser.add_argument('--max-mape', type=float, default=None, help='Accuracy bar for the cheapest-model recommendation')
+    parser.add_argument('--output', default=None, help='Write the full report, including every prediction, as JSON')
+    args = parser.parse_args()
+
+    report = run_backtest(args.data, args.models, args.horizon, args.min_train_years, args.workers)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    print(f"Backtest over cut-offs {report['cutoffs'][0]}-{report['cutoffs'][-1]}, horizon {report['horizon']}:")
+    print(f"{'model':<22}{'n':>5}{'MAE':>12}{'MAPE %':>9}{'fit s':>9}{'p50 us':>9}{'p95 us':>9}{'peak KB':>10}")
+    for kind, entry in sorted(report['summary'].items(), key=lambda item: item[1]['mape'] if item[1]['mape'] is not None else float('inf')):
+        print(f"{kind:<22}{entry['n_samples']:>5}{entry['mae']:>12,.0f}{entry['mape'] if entry['mape'] is not None else float('nan'):>9.2f}"
+              f"{entry['fit_seconds_mean']:>9.3f}{entry['latency_us_p50']:>9.1f}{entry['latency_us_p95']:>9.1f}{entry['peak_memory_kb']:>10.1f}")
+    if args.max_mape is not None:
+        print(f"Cheapest model with MAPE <= {args.max_mape}%: {cheapest_within(report['summary'], args.max_mape) or 'none'}")
@@ -0,0 +1,245 @@
+import os
+import json
+import numpy as np
+
+# Pickle-free model artifacts. Only the parameters inference needs are kept:
+# coefficients for the pooled linear regression and the MAP trend,
+# seasonality and regressor parameters for each Prophet model. The evaluators
+# below only need NumPy, so serving never imports sklearn or prophet.
+COMPACT_MODELS_PATH = os.path.join(os.path.dirname(__file__), 'compact_models.json')
+FORMAT_VERSION = 1
+
+SECONDS_PER_DAY = 24 * 60 * 60
+# Exported parameters that evaluation needs as arrays
+PROPHET_ARRAYS = ('deltas', 'changepoints_t', 'beta')
+LINEAR_REGRESSION_ARRAYS = ('coef',)
+
+# Loaded models per (path, kept sectors), so callers keeping different sectors share the cache
+_cache = {}
+
+def year_end_dates(years):
+    """Prophet was trained on one row per year dated 31 December"""
+    years = np.atleast_1d(np.asarray(years, dtype=int))
+    return (years - 1970).astype('datetime64[Y]') + np.timedelta64(12, 'M') - np.timedelta64(1, 'D')
+
+def _to_seconds(dates):
+    return np.atleast_1d(np.asarray(dates, dtype='datetime64[s]')).astype(np.int64).astype(float)
+
+def export_linear_regression(model):
+    return {
+        'feature_names': [str(name) for name in model.feature_names_in_],
+        'coef': [float(c) for c in model.coef_],
+        'intercept': float(model.intercept_)
+    }
+
+def export_prophet(model):
+    if model.growth not in ('linear', 'flat'):
+        raise ValueError(f'Unsupported Prophet growth: {model.growth}')
+    if model.holidays is not None or model.country_holidays is not None:
+        raise ValueError('Prophet holidays are not supported by the compact format')
+
+    features = []
+    for name, props in model.seasonalities.items():
+        if props['condition_name'] is not None:
+            raise ValueError(f'Conditional seasonality {name} is not supported by the compact format')
+        features.append({
+            'type': 'fourier',
+            'name': name,
+            'period': float(props['period']),
+            'order': int(props['fourier_order']),
+            'mode': props['mode']
+        })
+    for name, props in model.extra_regressors.items():
+        features.append({
+            'type': 'regressor',
+            'name': name,
+            'mu': float(props['mu']),
+            'std': float(props['std']),
+            'mode': props['mode']
+        })
+
+    beta = np.nanmean(model.params['beta'], axis=0)
+    width = sum(2 * f['order'] if f['type'] == 'fourier' else 1 for f in features)
+    if width != len(beta):
+        raise ValueError(f'Expected {width} seasonal coefficients, model has {len(beta)}')
+
+    floor = float(model.y_min) if getattr(model, 'scaling', 'absmax') == 'minmax' else 0.0
+    return {
+        'growth': model.growth,
+        'start': float(model.start.timestamp()),
+        't_scale': float(model.t_scale.total_seconds()),
+        'y_scale': float(model.y_scale),
+        'floor': floor,
+        'k': float(np.nanmean(model.params['k'])),
+        'm': float(np.nanmean(model.params['m'])),
+        'deltas': [float(d) for d in np.nanmean(model.params['delta'], axis=0)],
+        'changepoints_t': [float(c) for c in np.atleast_1d(model.changepoints_t)],
+        'features': features,
+        'beta': [float(b) for b in beta]
+    }
+
+def export_compact_models(models_dir=os.path.dirname(__file__), output_path=COMPACT_MODELS_PATH):
+    """Convert the pickled models in models_dir into a compact JSON artifact"""
+    import pickle
+
+    artifact = {'format_version': FORMAT_VERSION, 'linear_regression': None, 'prophet': {}}
+
+    linear_path = os.path.join(models_dir, 'linear_regression_model.pkl')
+    if os.path.exists(linear_path):
+        with open(linear_path, 'rb') as f:
+            artifact['linear_regression'] = export_linear_regression(pickle.load(f))
+
+    prophet_path = os.path.join(models_dir, 'prophet_models.pkl')
+    if os.path.exists(prophet_path):
+        with open(prophet_path, 'rb') as f:
+            prophet_models = pickle.load(f)
+        artifact['prophet'] = {sector: export_prophet(model) for sector, model in prophet_models.items()}
+
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(artifact, f, separators=(',', ':'))
+    os.replace(tmp_path, output_path)
+    return artifact
+
+def as_arrays(params, keys):
+    """Turn the listed JSON lists of an exported model into float arrays"""
+    for key in keys:
+        params[key] = np.asarray(params[key], dtype=float)
+    return params
+
+def load_compact_models(path=COMPACT_MODELS_PATH, keep=None):
+    """
+    Load and cache the compact models. `keep` is an optional collection of
+    sector names; other per-sector models are dropped before their parameters
+    are materialised, so a shard only holds its own sectors.
+    """
+    keep = frozenset(keep) if keep is not None else None
+    key = (os.path.abspath(path), keep)
+    mtime = os.path.getmtime(path)
+    cached = _cache.get(key)
+    if cached is None or cached['mtime'] != mtime:
+        with open(path, 'r') as f:
+            models = json.load(f)
+        if models.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact model format: {models.get('format_version')}")
+        if keep is not None:
+            models['prophet'] = {sector: params for sector, params in models['prophet'].items() if sector in keep}
+        for params in models['prophet'].values():
+            as_arrays(params, PROPHET_ARRAYS)
+        if models['linear_regression']:
+            as_arrays(models['linear_regression'], LINEAR_REGRESSION_ARRAYS)
+        cached = _cache[key] = {'mtime': mtime, 'models': models}
+    return cached['models']
+
+def linear_regression_features(params, years, installed_capacity, sectors):
+    """Build the design matrix the pooled regression was trained on"""
+    years = np.atleast_1d(np.asarray(years, dtype=float))
+    installed_capacity = np.broadcast_to(np.asarray(installed_capacity, dtype=float), years.shape)
+    sectors = np.broadcast_to(np.asarray(sectors, dtype=object), years.shape)
+    X = np.zeros((len(years), len(params['feature_names'])))
+    for j, name in enumerate(params['feature_names']):
+        if name == 'Year':
+            X[:, j] = years
+        elif name == 'Installed_Capacity_MW':
+            X[:, j] = installed_capacity
+        elif name.startswith('Sector_'):
+            X[:, j] = sectors == name[len('Sector_'):]
+    return X
+
+def predict_linear_regression(params, years, installed_capacity, sectors):
+    X = linear_regression_features(params, years, installed_capacity, sectors)
+    return X @ params['coef'] + params['intercept']
+
+def sweep_linear_regression(params, sectors, years, installed_capacities):
+    """
+    Evaluate the pooled regression over a sectors x years x MW grid by
+    broadcasting its coefficients rather than building a design matrix.
+    """
+    coef = dict(zip(params['feature_names'], params['coef']))
+    sector_offsets = np.array([coef.get(f'Sector_{sector}', 0.0) for sector in sectors], dtype=float)
+    years = np.asarray(years, dtype=float)
+    installed_capacities = np.asarray(installed_capacities, dtype=float)
+    return (params['intercept']
+            + sector_offsets[:, None, None]
+            + coef.get('Year', 0.0) * years[None, :, None]
+            + coef.get('Installed_Capacity_MW', 0.0) * installed_capacities[None, None, :])
+
+def predict_prophet(params, dates, regressors=None):
+    """Evaluate yhat of an exported Prophet model for an array of dates"""
+    seconds = _to_seconds(dates)
+    t = (seconds - params['start']) / params['t_scale']
+
+    if params['growth'] == 'linear':
+        changepoints_t = params['changepoints_t']
+        deltas_t = (changepoints_t[None, :] <= t[:, None]) * params['deltas']
+        k_t = deltas_t.sum(axis=1) + params['k']
+        m_t = (deltas_t * -changepoints_t).sum(axis=1) + params['m']
+        trend = k_t * t + m_t
+    else:
+        trend = np.full_like(t, params['m'])
+    trend = trend * params['y_scale'] + params['floor']
+
+    days = seconds / SECONDS_PER_DAY
+    regressors = regressors or {}
+    additive = np.zeros_like(t)
+    multiplicative = np.zeros_like(t)
+    offset = 0
+    for feature in params['features']:
+        if feature['type'] == 'fourier':
+            order = feature['order']
+            angles = 2 * np.pi * days[:, None] * np.arange(1, order + 1)[None, :] / feature['period']
+            columns = np.empty((len(t), 2 * order))
+            columns[:, 0::2] = np.sin(angles)
+            columns[:, 1::2] = np.cos(angles)
+        else:
+            values = np.broadcast_to(np.asarray(regressors.get(feature['name'], 0.0), dtype=float), t.shape)
+            columns = ((values - feature['mu']) / feature['std'])[:, None]
+        width = columns.shape[1]
+        component = columns @ params['beta'][offset:offset + width]
+        offset += width
+        if feature['mode'] == 'additive':
+            additive += component * params['y_scale']
+        else:
+            multiplicative += component
+
+    return trend * (1 + multiplicative) + additive
+
+def verify_compact_models(models_dir=os.path.dirname(__file__), path=COMPACT_MODELS_PATH, rtol=1e-6):
+    """
+    Compare the compact evaluators with the original pickled models and return
+    the largest relative error per model.
+    """
+    import pickle
+    import pandas as pd
+
+    compact = load_compact_models(path)
+    years = np.arange(2010, 2041)
+    capacities = np.linspace(0, 100000, len(years))
+    errors = {}
+
+    with open(os.path.join(models_dir, 'prophet_models.pkl'), 'rb') as f:
+        prophet_models = pickle.load(f)
+    for sector, model in prophet_models.items():
+        future = pd.DataFrame({'ds': pd.to_datetime([f'{y}-12-31' for y in years]), 'Installed_Capacity_MW': capacities})
+        expected = model.predict(future)['yhat'].values
+        actual = predict_prophet(compact['prophet'][sector], year_end_dates(years), {'Installed_Capacity_MW': capacities})
+        errors[f'prophet:{sector}'] = float(np.max(np.abs(actual - expected) / np.maximum(1.0, np.abs(expected))))
+
+    with open(os.path.join(models_dir, 'linear_regression_model.pkl'), 'rb') as f:
+        linear_model = pickle.load(f)
+    params = compact['linear_regression']
+    for sector in prophet_models:
+        X = linear_regression_features(params, years, capacities, sector)
+        expected = linear_model.predict(pd.DataFrame(X, columns=params['feature_names']))
+        actual = predict_linear_regression(params, years, capacities, sector)
+        errors[f'linear_regression:{sector}'] = float(np.max(np.abs(actual - expected) / np.maximum(1.0, np.abs(expected))))
+
+    failures = {name: error for name, error in errors.items() if error > rtol}
+    return errors, failures
+
+if __name__ == '__main__':
+    export_compact_models()
+    errors, failures = verify_compact_models()
+    for name, error in sorted(errors.items()):
+        print(f'{name}: max relative error {error:.2e}')
+    print('Compact models match the originals.' if not failures else f'Mismatches: {failures}')
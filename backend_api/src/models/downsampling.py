@@ -0,0 +1,70 @@
+import numpy as np
+
+# Largest-triangle-three-buckets downsampling for trend series. The first and
+# last points are always kept; every bucket in between contributes the point
+# forming the largest triangle with the point kept from the previous bucket
+# and the mean of the next one, which preserves peaks and turning points far
+# better than striding. All measures of a series share one set of indices,
+# chosen on actual jobs, so the chart lines stay aligned on the same x values.
+STANDARD_RESOLUTIONS = (50, 200, 1000)
+# Below this many points LTTB has nothing to choose between
+MIN_POINTS = 3
+
+def lttb_indices(x, y, threshold):
+    """Indices of the `threshold` points LTTB keeps from the series (x, y)"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n:
+        return np.arange(n)
+    if threshold < MIN_POINTS:
+        raise ValueError(f'max_points must be at least {MIN_POINTS}')
+
+    # threshold - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    indices = np.empty(threshold, dtype=int)
+    indices[0] = 0
+    indices[-1] = n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        # The average of the next bucket, or the last point for the final one
+        if bucket + 2 < len(edges):
+            next_x = x[end:edges[bucket + 2]].mean()
+            next_y = y[end:edges[bucket + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (next_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        indices[bucket + 1] = previous
+    return indices
+
+def downsample_series(series, max_points, x_key='years', y_key='actual_jobs'):
+    """The series with every list reduced to at most `max_points` LTTB points"""
+    if len(series[x_key]) <= max_points:
+        return series
+    indices = lttb_indices(series[x_key], series[y_key], max_points)
+    return {key: values[indices] if isinstance(values, np.ndarray) else [values[i] for i in indices]
+            for key, values in series.items()}
+
+def build_resolutions(data, resolutions=STANDARD_RESOLUTIONS):
+    """Downsample each sector once per standard resolution shorter than the series"""
+    return {
+        sector: {resolution: downsample_series(series, resolution)
+                 for resolution in resolutions if resolution < len(series['years'])}
+        for sector, series in data.items()
+    }
+
+def trend_series(series, precomputed, max_points=None):
+    """
+    The series to return for a `max_points` request: the full series when it
+    fits, else the largest precomputed resolution within the limit, else a
+    fresh downsample for limits below every standard resolution
+    """
+    if max_points is None or len(series['years']) <= max_points:
+        return series
+    fitting = [resolution for resolution in precomputed if resolution <= max_points]
+    if fitting:
+        return precomputed[max(fitting)]
+    return downsample_series(series, max_points)
@@ -0,0 +1,99 @@
+import os
+import sys
+import csv
+import json
+import argparse
+import tempfile
+import timeit
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+# Allow `python src/models/json_benchmark.py` from backend_api/
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.models import serialization
+from src.models.serialization import NumpyJSONProvider
+from src.models.storage import PandasStore, TREND_KEYS
+
+# Response encoding benchmark for /api/jobs/data and /api/jobs/trends. The
+# dataset is stretched in time (copies shifted by the series' span) so every
+# sector's trend series grows with the size. Each case builds the response
+# body the way the handler does:
+#   current   records / .tolist() columns, encoded by Flask's default provider
+#   stdlib    the NumPy-aware provider using the standard library encoder
+#   orjson    the NumPy-aware provider with orjson, when it is installed
+# and every variant must decode to the same JSON as the current path.
+DEFAULT_DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'india_jobs_data.csv')
+DEFAULT_SIZES = (1, 100, 1000)
+
+def write_stretched_csv(path, size, directory):
+    with open(path, mode='r') as file:
+        rows = list(csv.DictReader(file))
+    years = [int(row['Year']) for row in rows]
+    span = max(years) - min(years) + 1
+    output = os.path.join(directory, f'jobs_x{size}.csv')
+    with open(output, mode='w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        for copy in range(size):
+            writer.writerows(dict(row, Year=int(row['Year']) + copy * span) for row in rows)
+    return output
+
+def best_ms(function, repeat):
+    number = max(1, int(0.2 / max(min(timeit.repeat(function, number=1, repeat=3)), 1e-6)))
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number * 1000
+
+def cases(store):
+    """(endpoint, current body, new body) built as the handlers build them"""
+    sector = store.sectors()[0]
+    trends = store.trends(sector)
+    return [
+        # The store used to build records with to_dict('records')
+        ('data', lambda: store.df.to_dict('records'), lambda: store.records()),
+        ('trends', lambda: {key: values.tolist() for key, values in store.trends(sector).items()},
+         lambda: store.trends(sector)),
+        # The series already in hand, so only conversion and encoding are timed
+        ('trends-encode', lambda: {key: trends[key].tolist() for key in TREND_KEYS}, lambda: trends)
+    ]
+
+def run(data_path=DEFAULT_DATA_PATH, sizes=DEFAULT_SIZES, repeat=5):
+    app = Flask(__name__)
+    current = DefaultJSONProvider(app)
+    numpy_provider = NumpyJSONProvider(app)
+    orjson = serialization.orjson
+    results = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in sizes:
+            store = PandasStore(write_stretched_csv(data_path, size, work_dir))
+            for endpoint, current_body, new_body in cases(store):
+                expected = json.loads(current.response(current_body()).get_data())
+                timings = {'current': best_ms(lambda: current.response(current_body()), repeat)}
+                encoders = [('stdlib', None)] + ([('orjson', orjson)] if orjson else [])
+                for name, encoder in encoders:
+                    serialization.orjson = encoder
+                    try:
+                        if json.loads(numpy_provider.response(new_body()).get_data()) != expected:
+                            raise AssertionError(f'{endpoint} x{size}: {name} output differs from the current path')
+                        timings[name] = best_ms(lambda: numpy_provider.response(new_body()), repeat)
+                    finally:
+                        serialization.orjson = orjson
+                results.append({'endpoint': endpoint, 'size': size, 'rows': len(store.df),
+                                 'points': len(store.trends(store.sectors()[0])['years']), 'ms': timings})
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='JSON encoding benchmark for /data and /trends')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help='CSV to stretch')
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES), help='Dataset size multipliers')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"orjson: {'installed' if serialization.orjson else 'not installed'}")
+    print(f"{'endpoint':<16}{'rows':>9}{'points':>8}{'current ms':>12}{'stdlib ms':>11}{'orjson ms':>11}{'speedup':>9}")
+    for result in run(args.data, args.sizes, args.repeat):
+        ms = result['ms']
+        fastest = min(value for name, value in ms.items() if name != 'current')
+        orjson_ms = f"{ms['orjson']:>11.3f}" if 'orjson' in ms else f"{'-':>11}"
+        print(f"{result['endpoint']:<16}{result['rows']:>9}{result['points']:>8}{ms['current']:>12.3f}{ms['stdlib']:>11.3f}"
+              f"{orjson_ms}{ms['current'] / fastest:>8.1f}x")
@@ -0,0 +1,264 @@
+import os
+import sys
+import csv
+import json
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+import tracemalloc
+
+# Memory benchmark for the API workers. Every scenario (backend x dataset
+# size x model set) runs in a fresh interpreter so its numbers are those of a
+# single worker. Each child records:
+#   rss_start_kb        RSS of the bare interpreter
+#   rss_steady_kb       RSS after loading data and models and serving requests
+#   rss_request_peak_kb highest sampled RSS while serving requests
+#   rss_peak_kb         lifetime peak RSS (VmHWM / ru_maxrss)
+#   traced_current_kb   Python allocations still live at steady state
+#   traced_peak_kb      peak Python allocations (tracemalloc)
+# Results are compared against memory_baseline.json and the run fails when a
+# metric grows beyond the tolerance; --update-baseline records a new one.
+MODELS_DIR = os.path.dirname(os.path.abspath(__file__))
+API_DIR = os.path.abspath(os.path.join(MODELS_DIR, '..', '..'))
+FINAL_DIR = os.path.abspath(os.path.join(API_DIR, '..', 'backend_final'))
+DEFAULT_DATA_PATH = os.path.join(MODELS_DIR, '..', 'data', 'jobs_data.csv')
+BASELINE_PATH = os.path.join(MODELS_DIR, 'memory_baseline.json')
+
+BACKENDS = ('backend_api', 'backend_final', 'jobs_pandas', 'jobs_sqlite')
+# The main apps load a fixed model set; the jobs blueprint is measured with
+# the compact models it serves and with the legacy pickles loaded as well
+MODEL_SETS = {
+    'backend_api': ('served',),
+    'backend_final': ('none',),
+    'jobs_pandas': ('compact', 'pickles'),
+    'jobs_sqlite': ('compact', 'pickles')
+}
+DEFAULT_SIZES = (1, 10, 50)
+COMPARED_METRICS = ('rss_steady_kb', 'rss_peak_kb', 'traced_peak_kb')
+DEFAULT_TOLERANCE = 0.10
+# Absolute slack so tiny scenarios do not fail on allocator noise
+SLACK_KB = 2048
+SAMPLE_INTERVAL = 0.005
+
+def rss_kb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return peak_rss_kb()
+
+def peak_rss_kb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+class RSSSampler(threading.Thread):
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.peak = 0
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            self.peak = max(self.peak, rss_kb())
+            time.sleep(SAMPLE_INTERVAL)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self.peak = max(self.peak, rss_kb())
+        return self.peak
+
+def scaled_rows(path, size):
+    """The dataset repeated `size` times, with copies as new sectors"""
+    with open(path, mode='r') as file:
+        rows = list(csv.DictReader(file))
+    scaled = []
+    for copy in range(size):
+        for row in rows:
+            scaled.append(dict(row, Sector=row['Sector'] if copy == 0 else f"{row['Sector']}_{copy}"))
+    return scaled
+
+def write_scaled_csv(path, size, directory):
+    rows = scaled_rows(path, size)
+    output = os.path.join(directory, f'jobs_x{size}.csv')
+    with open(output, mode='w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return output
+
+def load_model_set(model_set, jobs=None):
+    if model_set == 'compact':
+        from mw_job_predictor import load_stats
+        # Through the blueprint's own loader, so nothing is held twice
+        jobs.load_models()
+        load_stats()
+    elif model_set == 'pickles':
+        import pickle
+        import joblib
+        for name in ('prophet_models.pkl', 'linear_regression_model.pkl'):
+            with open(os.path.join(MODELS_DIR, name), 'rb') as f:
+                pickle.load(f)
+        joblib.load(os.path.join(MODELS_DIR, 'mw_job_predictors.pkl'))
+
+def exercise(client, sectors, jobs_blueprint):
+    """The requests a warm worker typically serves, once per sector"""
+    for path in ('/api/jobs/sectors', '/api/jobs/years'):
+        client.get(path)
+    if jobs_blueprint:
+        client.get('/api/jobs/data')
+    for sector in sectors:
+        client.get('/api/jobs/trends', query_string={'sector': sector})
+        client.get('/api/jobs/insights', query_string={'sector': sector})
+        if jobs_blueprint:
+            client.post('/api/jobs/predict', json={'sector': sector, 'year': 2030, 'installed_capacity': 10000})
+        else:
+            client.post('/api/jobs/predict', json={'sector': sector, 'year': 2030})
+
+def run_child(backend, size, model_set, data_path, work_dir):
+    """Measure one scenario inside this (fresh) interpreter"""
+    tracemalloc.start()
+    rss_start = rss_kb()
+    os.environ.update({'WARMUP_IN_BACKGROUND': '0', 'SHARED_CACHE_PATH': os.path.join(work_dir, 'cache.bin')})
+
+    if backend == 'backend_api':
+        os.environ['JOBS_DATA_PATH'] = data_path
+        sys.path.insert(0, API_DIR)
+        from src import main as app_module
+        app = app_module.app
+        sectors = app_module.SAMPLE_DATA['sectors']
+    elif backend == 'backend_final':
+        # backend_final has its own copies of the shared modules
+        sys.path.remove(MODELS_DIR)
+        sys.path.insert(0, FINAL_DIR)
+        from src import main as app_module
+        if size > 1:
+            app_module.EMBEDDED_DATA = scaled_rows(data_path, size)
+            app_module.load_data()
+        app = app_module.app
+        sectors = app_module.SAMPLE_DATA['sectors']
+    else:
+        os.environ['JOBS_STORAGE_BACKEND'] = backend.split('_', 1)[1]
+        sys.path.insert(0, API_DIR)
+        from flask import Flask
+        from src.models import storage
+        storage.DATABASE_DIR = work_dir
+        from src.routes import jobs
+        jobs.DATA_PATH = data_path
+        app = Flask(__name__)
+        app.register_blueprint(jobs.jobs_bp, url_prefix='/api/jobs')
+        sectors = jobs.load_data().sectors()
+
+    sys.path.insert(0, MODELS_DIR)
+    load_model_set(model_set, jobs if backend.startswith('jobs_') else None)
+
+    client = app.test_client()
+    sampler = RSSSampler()
+    sampler.start()
+    exercise(client, sectors, backend.startswith('jobs_'))
+    request_peak = sampler.stop()
+
+    import gc
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    return {
+        'backend': backend,
+        'size': size,
+        'model_set': model_set,
+        'rss_start_kb': rss_start,
+        'rss_steady_kb': rss_kb(),
+        'rss_request_peak_kb': request_peak,
+        'rss_peak_kb': peak_rss_kb(),
+        'traced_current_kb': round(current / 1024),
+        'traced_peak_kb': round(peak / 1024)
+    }
+
+def scenario_key(result):
+    return f"{result['backend']}/x{result['size']}/{result['model_set']}"
+
+def run_suite(backends=BACKENDS, sizes=DEFAULT_SIZES, data_path=DEFAULT_DATA_PATH):
+    """Run every scenario in its own interpreter; returns (results, failed scenario keys)"""
+    results = []
+    failed = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for size in sizes:
+            scaled_path = write_scaled_csv(data_path, size, work_dir)
+            for backend in backends:
+                for model_set in MODEL_SETS[backend]:
+                    scenario_dir = tempfile.mkdtemp(dir=work_dir)
+                    completed = subprocess.run(
+                        [sys.executable, os.path.abspath(__file__), '--child', backend, str(size), model_set, scaled_path, scenario_dir],
+                        capture_output=True, text=True, cwd=MODELS_DIR)
+                    if completed.returncode != 0:
+                        print(f"{backend} x{size} {model_set} failed:\n{completed.stderr[-2000:]}")
+                        failed.append(f'{backend}/x{size}/{model_set}')
+                        continue
+                    # The child's app may print while loading; the result is the last line
+                    results.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    return results, failed
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """Metrics that grew beyond the baseline, as (scenario, metric, baseline, measured)"""
+    regressions = []
+    for result in results:
+        expected = baseline.get('scenarios', {}).get(scenario_key(result))
+        if not expected:
+            continue
+        for metric in COMPARED_METRICS:
+            limit = expected[metric] * (1 + tolerance) + SLACK_KB
+            if result[metric] > limit:
+                regressions.append((scenario_key(result), metric, expected[metric], result[metric]))
+    return regressions
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        backend, size, model_set, data_path, work_dir = sys.argv[2:7]
+        print(json.dumps(run_child(backend, int(size), model_set, data_path, work_dir)))
+        sys.exit(0)
+
+    parser = argparse.ArgumentParser(description='Per-worker memory benchmark with a baseline guard')
+    parser.add_argument('--backends', nargs='+', choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES), help='Dataset size multipliers')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help='CSV to scale up')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE, help='Allowed relative growth over the baseline')
+    parser.add_argument('--update-baseline', action='store_true', help='Record these results as the new baseline')
+    args = parser.parse_args()
+
+    results, failed = run_suite(args.backends, args.sizes, args.data)
+    print(f"{'scenario':<32}{'start MB':>10}{'steady MB':>11}{'req peak MB':>13}{'peak MB':>9}{'traced MB':>11}{'traced pk MB':>14}")
+    for result in results:
+        print(f"{scenario_key(result):<32}{result['rss_start_kb'] / 1024:>10.1f}{result['rss_steady_kb'] / 1024:>11.1f}"
+              f"{result['rss_request_peak_kb'] / 1024:>13.1f}{result['rss_peak_kb'] / 1024:>9.1f}"
+              f"{result['traced_current_kb'] / 1024:>11.1f}{result['traced_peak_kb'] / 1024:>14.1f}")
+
+    if failed:
+        print(f"Failed scenarios: {', '.join(failed)}")
+        sys.exit(1)
+
+    if args.update_baseline:
+        baseline = {
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'scenarios': {scenario_key(result): {metric: result[metric] for metric in COMPARED_METRICS} for result in results}
+        }
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        sys.exit(0)
+
+    if not os.path.exists(args.baseline):
+        print('No baseline recorded; run with --update-baseline first')
+        sys.exit(0)
+    with open(args.baseline, 'r') as f:
+        regressions = compare(results, json.load(f), args.tolerance)
+    for key, metric, expected, measured in regressions:
+        print(f"REGRESSION {key} {metric}: {measured} KB > baseline {expected} KB (+{args.tolerance:.0%})")
+    sys.exit(1 if regressions else 0)
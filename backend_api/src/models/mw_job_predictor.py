@@ -1,10 +1,152 @@
 import os
-import pandas as pd
-from sklearn.linear_model import LinearRegression
-import joblib
+import json
+import math
+from contextlib import contextmanager
+import numpy as np
 from data_preprocessor import preprocess_data
 
+# Per-sector sufficient statistics for the simple MW -> jobs regression.
+# Keeping (n, sum_x, sum_y, sum_xy, sum_xx) lets a new observation update the
+# fit in O(1) and lets the serving path predict without sklearn.
+# mw_job_stats.json holds the statistics trained from the CSV and is only
+# rewritten by training. Online observations are summed in a runtime file
+# (MW_OBSERVATIONS_PATH, by default in the gitignored src/instance/) and added
+# on top when the statistics are served, so a retrain never drops them.
+STATS_PATH = os.path.join(os.path.dirname(__file__), 'mw_job_stats.json')
+OBSERVATIONS_PATH = os.environ.get('MW_OBSERVATIONS_PATH', os.path.join(os.path.dirname(__file__), '..', 'instance', 'mw_job_observations.json'))
+# The CSV the shipped statistics and pickles were trained on
+DEFAULT_DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'india_jobs_data_v2.csv')
+MODELS_PATH = os.path.join(os.path.dirname(__file__), 'mw_job_predictors.pkl')
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_stats_cache = {'version': None, 'stats': None}
+
+def empty_stats():
+    return {'n': 0, 'sum_x': 0.0, 'sum_y': 0.0, 'sum_xy': 0.0, 'sum_xx': 0.0}
+
+def update_stats(stats, mw_capacity, actual_jobs):
+    """Fold one (MW, jobs) observation into a sector's statistics"""
+    x = float(mw_capacity)
+    y = float(actual_jobs)
+    stats['n'] += 1
+    stats['sum_x'] += x
+    stats['sum_y'] += y
+    stats['sum_xy'] += x * y
+    stats['sum_xx'] += x * x
+    return stats
+
+def coefficients_from_stats(stats):
+    """Closed-form least squares slope and intercept"""
+    n = stats['n']
+    if n == 0:
+        return None
+    denominator = n * stats['sum_xx'] - stats['sum_x'] ** 2
+    # A single point or a constant capacity series has no slope; fall back to
+    # the mean, which is also what LinearRegression returns in that case.
+    if n < 2 or abs(denominator) <= 1e-12 * max(1.0, n * stats['sum_xx']):
+        slope = 0.0
+    else:
+        slope = (n * stats['sum_xy'] - stats['sum_x'] * stats['sum_y']) / denominator
+    intercept = (stats['sum_y'] - slope * stats['sum_x']) / n
+    return slope, intercept
+
+def build_stats(data_path):
+    """Compute sufficient statistics for every sector from a CSV"""
+    df = preprocess_data(data_path)
+    all_stats = {}
+    for sector, mw, jobs in zip(df['Sector'], df['Installed_Capacity_MW'], df['Actual_Jobs']):
+        update_stats(all_stats.setdefault(sector, empty_stats()), mw, jobs)
+    return all_stats
+
+def rebuild_stats(data_path, stats_path=STATS_PATH):
+    """Rewrite the trained stats file from a CSV; online observations are kept apart"""
+    with stats_lock(stats_path):
+        all_stats = build_stats(data_path)
+        save_stats(all_stats, stats_path)
+    return all_stats
+
+def merge_stats(all_stats, extra):
+    """Add another set of per-sector statistics into all_stats, for sectors it has"""
+    for sector, stats in extra.items():
+        if sector in all_stats:
+            for key, value in stats.items():
+                all_stats[sector][key] += value
+    return all_stats
+
+def read_stats(stats_path=STATS_PATH):
+    with open(stats_path, 'r') as f:
+        return json.load(f)
+
+def file_version(path):
+    # Saves replace the file, so the inode changes even within one mtime tick
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+def read_observations(observations_path=OBSERVATIONS_PATH):
+    try:
+        return read_stats(observations_path)
+    except FileNotFoundError:
+        return {}
+
+def load_stats(stats_path=STATS_PATH, observations_path=OBSERVATIONS_PATH):
+    """The served statistics: the trained ones plus every online observation"""
+    # Reload only when either file changes so every worker picks up online updates
+    version = (stats_path, file_version(stats_path), observations_path, file_version(observations_path))
+    if _stats_cache['version'] != version or _stats_cache['stats'] is None:
+        _stats_cache['stats'] = merge_stats(read_stats(stats_path), read_observations(observations_path))
+        _stats_cache['version'] = version
+    return _stats_cache['stats']
+
+@contextmanager
+def stats_lock(stats_path=STATS_PATH):
+    """Exclusive lock that serialises read-modify-write cycles across workers"""
+    with open(stats_path + '.lock', 'a') as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def save_stats(all_stats, stats_path=STATS_PATH):
+    # Written to a temporary file and swapped in, so readers never see half a file
+    tmp_path = f'{stats_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(all_stats, f, indent=2, sort_keys=True, allow_nan=False)
+    os.replace(tmp_path, stats_path)
+
+def add_observation(sector, mw_capacity, actual_jobs, stats_path=STATS_PATH, observations_path=OBSERVATIONS_PATH):
+    """Incrementally refit a known sector's model with one new observation"""
+    mw_capacity = float(mw_capacity)
+    actual_jobs = float(actual_jobs)
+    if not (math.isfinite(mw_capacity) and math.isfinite(actual_jobs)):
+        raise ValueError('MW capacity and actual jobs must be finite numbers')
+    trained = read_stats(stats_path)
+    if sector not in trained:
+        raise ValueError(f'Unknown sector: {sector}')
+    os.makedirs(os.path.dirname(os.path.abspath(observations_path)), exist_ok=True)
+    with stats_lock(observations_path):
+        # Read under the lock, not from the cache, so no concurrent update is lost
+        observations = read_observations(observations_path)
+        update_stats(observations.setdefault(sector, empty_stats()), mw_capacity, actual_jobs)
+        save_stats(observations, observations_path)
+    stats = merge_stats({sector: trained[sector]}, {sector: observations[sector]})[sector]
+    slope, intercept = coefficients_from_stats(stats)
+    return {'sector': sector, 'n': stats['n'], 'coef': slope, 'intercept': intercept}
+
 def train_mw_predictor(data_path):
+    # sklearn is only needed for the full retrain, not for serving
+    import joblib
+    from sklearn.linear_model import LinearRegression
+
     df = preprocess_data(data_path)
     # For simplicity, let's assume a linear relationship between Installed_Capacity_MW and Actual_Jobs
     # We'll train a separate model for each sector
@@ -16,17 +158,37 @@ def train_mw_predictor(data_path):
         model = LinearRegression()
         model.fit(X, y)
         models[sector] = model
-    joblib.dump(models, 'mw_job_predictors.pkl')
+    joblib.dump(models, MODELS_PATH)
+    rebuild_stats(data_path)
     print('MW job prediction models trained and saved.')
+    return models
+
+def verify_stats(data_path, tolerance=1e-6, stats_path=STATS_PATH):
+    """
+    Full-retrain verification path: fit sklearn per sector and compare with
+    the coefficients of the trained statistics. Online observations are not
+    in the CSV, so they are left out. Returns mismatching sectors.
+    """
+    from sklearn.linear_model import LinearRegression
+
+    df = preprocess_data(data_path)
+    all_stats = read_stats(stats_path)
+    mismatches = {}
+    for sector in df['Sector'].unique():
+        sector_df = df[df['Sector'] == sector]
+        model = LinearRegression().fit(sector_df[['Installed_Capacity_MW']], sector_df['Actual_Jobs'])
+        expected = (float(model.coef_[0]), float(model.intercept_))
+        actual = coefficients_from_stats(all_stats[sector]) if sector in all_stats else None
+        if actual is None or any(abs(e - a) > tolerance * max(1.0, abs(e)) for e, a in zip(expected, actual)):
+            mismatches[sector] = {'expected': expected, 'actual': actual}
+    return mismatches
 
 def predict_jobs_from_mw(mw_capacity, sector):
     try:
-        # Use relative path from the models directory
-        model_path = os.path.join(os.path.dirname(__file__), 'mw_job_predictors.pkl')
-        models = joblib.load(model_path)
-        model = models.get(sector)
-        if model:
-            prediction = model.predict([[mw_capacity]])[0]
+        stats = load_stats().get(sector)
+        if stats:
+            slope, intercept = coefficients_from_stats(stats)
+            prediction = intercept + slope * float(mw_capacity)
             return max(0, int(prediction)) # Ensure non-negative job predictions
         else:
             return None # Sector not found
@@ -34,12 +196,24 @@ def predict_jobs_from_mw(mw_capacity, sector):
         print("Error: MW job prediction models not found. Please train them first.")
         return None
 
+def sweep_jobs_from_mw(mw_capacities, sectors):
+    """
+    Predict jobs for every (sector, MW) pair at once. Returns a
+    len(sectors) x len(mw_capacities) matrix, or None for unknown sectors.
+    """
+    all_stats = load_stats()
+    if any(sector not in all_stats for sector in sectors):
+        return None
+    coefficients = np.array([coefficients_from_stats(all_stats[sector]) for sector in sectors], dtype=float).reshape(-1, 2)
+    mw = np.asarray(mw_capacities, dtype=float)
+    predictions = coefficients[:, 1:2] + coefficients[:, 0:1] * mw[None, :]
+    return np.maximum(predictions, 0).astype(np.int64)
+
 if __name__ == '__main__':
     # Example usage:
     # Use relative path to the data directory
-    data_path = os.path.join(os.path.dirname(__file__), '..', 'data', 'jobs_data.csv')
+    data_path = DEFAULT_DATA_PATH
     train_mw_predictor(data_path)
+    print(f"Verification mismatches: {verify_stats(data_path)}")
     print(f"Predicted jobs for Solar with 4000 MW: {predict_jobs_from_mw(4000, 'Solar')}")
     print(f"Predicted jobs for Wind with 6000 MW: {predict_jobs_from_mw(6000, 'Wind')}")
-
-
@@ -0,0 +1,143 @@
+import csv
+import numpy as np
+
+# Long-format columnar store holding both the sector jobs data and the IRENA
+# India-vs-World table. Every row is (dataset, region, sector, year, jobs);
+# columns are NumPy arrays and an in-memory index maps each
+# (dataset, region, sector) series to its row positions sorted by year, so
+# comparisons and joins are index lookups rather than per-request merges.
+SECTOR_DATASET = 'sector_jobs'
+IRENA_DATASET = 'irena'
+
+# The India-vs-World table reports thousands of jobs. Its "World Only" column
+# is the world total across all renewables; the other columns are India's
+# jobs per technology.
+IRENA_UNIT = 1000
+WORLD_COLUMN = 'World Only'
+ALL_TECHNOLOGIES = 'All renewables'
+
+# IRENA technologies that correspond to a sector in the jobs data
+TECHNOLOGY_SECTORS = {
+    'Solar PV': 'Solar',
+    'Wind Power': 'Wind',
+    'Hydro Power': 'Hydroelectric',
+    'Solid Biomass': 'Biomass'
+}
+
+def melt_india_world(path):
+    """Melt the wide FY x technology table into long (region, sector, year, jobs) rows"""
+    rows = []
+    with open(path, mode='r') as file:
+        reader = csv.DictReader(file)
+        for row in reader:
+            year = int(row['FY'])
+            for column, value in row.items():
+                if column == 'FY' or value in (None, ''):
+                    continue
+                jobs = float(value.replace(',', '')) * IRENA_UNIT
+                if column == WORLD_COLUMN:
+                    rows.append((IRENA_DATASET, 'World', ALL_TECHNOLOGIES, year, jobs))
+                else:
+                    rows.append((IRENA_DATASET, 'India', column, year, jobs))
+    return rows
+
+def sector_rows(data):
+    """Rows for the sector jobs data, which is all for India"""
+    return [(SECTOR_DATASET, 'India', sector, year, float(jobs))
+            for sector, sector_data in data['data'].items()
+            for year, jobs in zip(sector_data['years'], sector_data['actual_jobs'])]
+
+def series(store, dataset, region, sector):
+    """Years and jobs of one series, or two empty arrays"""
+    rows = store['index'].get((dataset, region, sector))
+    if rows is None:
+        return np.empty(0, dtype=int), np.empty(0)
+    return store['columns']['year'][rows], store['columns']['jobs'][rows]
+
+def _percent(numerator, denominator):
+    out = np.full(len(numerator), np.nan)
+    np.divide(numerator * 100, denominator, out=out, where=denominator != 0)
+    return out
+
+def _comparison_rows(years, values):
+    return [
+        {'year': int(year), **{name: (None if np.isnan(column[i]) else round(float(column[i]), 2)) for name, column in values.items()}}
+        for i, year in enumerate(years)
+    ]
+
+def build_store(data, india_world_path):
+    rows = sector_rows(data) + melt_india_world(india_world_path)
+    dataset, region, sector, year, jobs = zip(*rows)
+    columns = {
+        'dataset': np.array(dataset),
+        'region': np.array(region),
+        'sector': np.array(sector),
+        'year': np.array(year, dtype=int),
+        'jobs': np.array(jobs, dtype=float)
+    }
+
+    index = {}
+    order = np.lexsort((columns['year'], columns['sector'], columns['region'], columns['dataset']))
+    for position in order:
+        key = (columns['dataset'][position], columns['region'][position], columns['sector'][position])
+        index.setdefault(key, []).append(position)
+    index = {key: np.array(positions) for key, positions in index.items()}
+
+    store = {'columns': columns, 'index': index}
+    store['technologies'] = sorted(key[2] for key in index if key[0] == IRENA_DATASET and key[1] == 'India')
+    store['india_vs_world'] = build_india_vs_world(store)
+    store['sector_vs_world'] = build_sector_vs_world(store)
+    return store
+
+def build_india_vs_world(store):
+    """Precompute India's jobs and share of world jobs per FY and technology"""
+    world_years, world_jobs = series(store, IRENA_DATASET, 'World', ALL_TECHNOLOGIES)
+    india_total = np.zeros(len(world_years))
+    comparisons = {}
+    for technology in store['technologies']:
+        years, jobs = series(store, IRENA_DATASET, 'India', technology)
+        common, india_pos, world_pos = np.intersect1d(years, world_years, assume_unique=True, return_indices=True)
+        np.add.at(india_total, world_pos, jobs[india_pos])
+        comparisons[technology] = _comparison_rows(common, {
+            'india_jobs': jobs[india_pos],
+            'world_jobs': world_jobs[world_pos],
+            'share_of_world_pct': _percent(jobs[india_pos], world_jobs[world_pos])
+        })
+    comparisons[ALL_TECHNOLOGIES] = _comparison_rows(world_years, {
+        'india_jobs': india_total,
+        'world_jobs': world_jobs,
+        'share_of_world_pct': _percent(india_total, world_jobs)
+    })
+    return comparisons
+
+def build_sector_vs_world(store):
+    """
+    Join the sector jobs data with the IRENA table on (sector, year) through
+    the series index, for every sector that has a matching technology
+    """
+    world_years, world_jobs = series(store, IRENA_DATASET, 'World', ALL_TECHNOLOGIES)
+    joined = {}
+    for technology, sector in TECHNOLOGY_SECTORS.items():
+        sector_years, sector_jobs = series(store, SECTOR_DATASET, 'India', sector)
+        irena_years, irena_jobs = series(store, IRENA_DATASET, 'India', technology)
+        if len(sector_years) == 0 or len(irena_years) == 0:
+            continue
+        common, sector_pos, irena_pos = np.intersect1d(sector_years, irena_years, assume_unique=True, return_indices=True)
+        common, common_pos, world_pos = np.intersect1d(common, world_years, assume_unique=True, return_indices=True)
+        sector_pos = sector_pos[common_pos]
+        irena_pos = irena_pos[common_pos]
+        joined[sector] = {
+            'technology': technology,
+            'rows': _comparison_rows(common, {
+                'sector_actual_jobs': sector_jobs[sector_pos],
+                'irena_india_jobs': irena_jobs[irena_pos],
+                'world_jobs': world_jobs[world_pos],
+                'share_of_world_pct': _percent(sector_jobs[sector_pos], world_jobs[world_pos]),
+                'irena_share_of_world_pct': _percent(irena_jobs[irena_pos], world_jobs[world_pos])
+            })
+        }
+    return joined
+
+def filter_years(rows, from_year=None, to_year=None):
+    return [row for row in rows
+            if (from_year is None or row['year'] >= from_year) and (to_year is None or row['year'] <= to_year)]
@@ -0,0 +1,55 @@
+import os
+import bisect
+import hashlib
+
+# Sector-sharded serving. Every node of a shard group is listed in
+# SHARD_NODES (comma-separated base URLs) and each node sets SHARD_NODE to its
+# own URL. Sectors are placed on a consistent-hash ring, so adding or removing
+# a node only moves the sectors on the arcs it gains or loses. With
+# SHARD_NODES unset the process serves every sector, as before.
+SHARD_NODES = [node.strip().rstrip('/') for node in os.environ.get('SHARD_NODES', '').split(',') if node.strip()]
+SHARD_NODE = os.environ.get('SHARD_NODE', '').rstrip('/') or None
+# Points per node on the ring; more points give a more even split
+VIRTUAL_NODES = int(os.environ.get('SHARD_VIRTUAL_NODES', 64))
+
+def ring_hash(value):
+    return int(hashlib.md5(value.encode()).hexdigest()[:16], 16)
+
+class HashRing:
+    def __init__(self, nodes, virtual_nodes=VIRTUAL_NODES):
+        if not nodes:
+            raise ValueError('A hash ring needs at least one node')
+        self.nodes = list(nodes)
+        points = sorted((ring_hash(f'{node}#{i}'), node) for node in self.nodes for i in range(virtual_nodes))
+        self._hashes = [point for point, _ in points]
+        self._owners = [node for _, node in points]
+
+    def node_for(self, key):
+        """The first node clockwise from the key's position on the ring"""
+        position = bisect.bisect(self._hashes, ring_hash(key)) % len(self._hashes)
+        return self._owners[position]
+
+    def assign(self, keys):
+        """Group keys by owning node, keeping their order within each group"""
+        groups = {}
+        for key in keys:
+            groups.setdefault(self.node_for(key), []).append(key)
+        return groups
+
+RING = HashRing(SHARD_NODES) if SHARD_NODES else None
+
+if RING is not None and SHARD_NODE is not None and SHARD_NODE not in SHARD_NODES:
+    raise ValueError(f'SHARD_NODE {SHARD_NODE} is not listed in SHARD_NODES')
+
+def shard_for(sector):
+    return RING.node_for(sector) if RING is not None else None
+
+def owns_sector(sector):
+    """True if this process serves the sector (always, when not sharded)"""
+    return RING is None or SHARD_NODE is None or RING.node_for(sector) == SHARD_NODE
+
+def owned_sectors(sectors):
+    """The sectors this process serves, or None when it serves every sector"""
+    if RING is None or SHARD_NODE is None:
+        return None
+    return frozenset(sector for sector in sectors if RING.node_for(sector) == SHARD_NODE)
@@ -0,0 +1,78 @@
+import os
+import re
+import gzip
+import hashlib
+import mimetypes
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# In-memory index of the built frontend. static/ is walked once at startup;
+# each file is held with its ETag and, for text types, pre-built gzip and
+# brotli variants, so serving a request never touches the filesystem.
+# Vite writes bundles to assets/ as name-<8 char hash>.ext, so those never
+# change under the same URL and are cached as immutable for a year. The hash
+# must contain a digit or capital, so plain names like site-manifest.json do
+# not pass for one. Everything else (index.html, favicon) is revalidated
+# against its ETag.
+BUILD_DIR = 'assets/'
+FINGERPRINTED = re.compile(r'-(?=[^.]*[0-9A-Z])[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$')
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE = 'no-cache'
+
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml', 'application/xml')
+# Below this size the compressed headers outweigh the saving
+MIN_COMPRESS_BYTES = 1024
+# Files larger than this are indexed but streamed from disk instead of held in memory
+MAX_CACHED_BYTES = int(os.environ.get('STATIC_MAX_CACHED_BYTES', 8 * 1024 * 1024))
+
+def _variants(body, mimetype):
+    variants = {}
+    if len(body) < MIN_COMPRESS_BYTES or not mimetype.startswith(COMPRESSIBLE_TYPES):
+        return variants
+    compressed = gzip.compress(body, compresslevel=9, mtime=0)
+    if len(compressed) < len(body):
+        variants['gzip'] = compressed
+    if brotli is not None:
+        compressed = brotli.compress(body, quality=11)
+        if len(compressed) < len(body):
+            variants['br'] = compressed
+    return variants
+
+def is_fingerprinted(path):
+    """True for hashed build output, which can be cached as immutable"""
+    return path.startswith(BUILD_DIR) and FINGERPRINTED.search(path.rsplit('/', 1)[-1]) is not None
+
+def build_static_index(static_dir):
+    """Map every URL path under static_dir to its bytes, variants and headers"""
+    index = {}
+    if not static_dir or not os.path.isdir(static_dir):
+        return index
+    for root, _, files in os.walk(static_dir):
+        for name in files:
+            full_path = os.path.join(root, name)
+            path = os.path.relpath(full_path, static_dir).replace(os.sep, '/')
+            mimetype = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+            entry = {
+                'mimetype': mimetype,
+                'cache_control': IMMUTABLE_CACHE if is_fingerprinted(path) else REVALIDATE_CACHE
+            }
+            if os.path.getsize(full_path) > MAX_CACHED_BYTES:
+                entry['file'] = full_path
+            else:
+                with open(full_path, 'rb') as f:
+                    body = f.read()
+                entry['body'] = body
+                entry['etag'] = hashlib.sha256(body).hexdigest()[:16]
+                entry['variants'] = _variants(body, mimetype)
+            index[path] = entry
+    return index
+
+def choose_encoding(entry, accept_encodings):
+    """Best pre-built variant the client accepts, preferring brotli"""
+    for encoding in ('br', 'gzip'):
+        if encoding in entry.get('variants', {}) and accept_encodings[encoding] > 0:
+            return encoding
+    return None
@@ -0,0 +1,223 @@
+import os
+import hashlib
+import sqlite3
+import threading
+
+import numpy as np
+
+from src.models.data_preprocessor import preprocess_data
+from src.models.time_index import TimeIndex, year_bounds
+
+# Pluggable storage for the jobs data behind routes/jobs.py. JOBS_STORAGE_BACKEND
+# selects the engine:
+#   pandas  - the preprocessed CSV held in memory as a DataFrame (default)
+#   sqlite  - an embedded SQLite file indexed on (sector, year)
+#   duckdb  - the same schema in DuckDB, if the duckdb package is installed
+# The SQL backends push filters down to parameterised queries and keep one
+# read-only connection per worker process and thread. Every backend takes an
+# exact year and/or an inclusive from_year/to_year range on records and trends.
+# A store may be limited to a set of sectors, so a shard holds only its own rows.
+STORAGE_BACKEND = os.environ.get('JOBS_STORAGE_BACKEND', 'pandas')
+DATABASE_DIR = os.path.join(os.path.dirname(__file__), '..', 'database')
+
+COLUMNS = ('Year', 'Sector', 'Estimated_Jobs', 'Actual_Jobs', 'Installed_Capacity_MW')
+TREND_KEYS = ('years', 'estimated_jobs', 'actual_jobs', 'installed_capacity')
+TREND_COLUMNS = ('Year', 'Estimated_Jobs', 'Actual_Jobs', 'Installed_Capacity_MW')
+# Stand-ins for an open end of a year range in SQL
+YEAR_MIN, YEAR_MAX = -2 ** 31, 2 ** 31 - 1
+
+SCHEMA = [
+    """CREATE TABLE jobs (
+        row_order INTEGER NOT NULL,
+        year INTEGER NOT NULL,
+        sector VARCHAR NOT NULL,
+        estimated_jobs BIGINT NOT NULL,
+        actual_jobs BIGINT NOT NULL,
+        installed_capacity_mw DOUBLE NOT NULL
+    )""",
+    'CREATE INDEX idx_jobs_sector_year ON jobs (sector, year)',
+    'CREATE INDEX idx_jobs_year ON jobs (year)'
+]
+INSERT_ROW = 'INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?)'
+# Column types of the schema. Preprocessing can leave float columns behind
+# (to_numeric on a column with gaps), so every backend casts to these and
+# returns the same JSON.
+COLUMN_TYPES = {'Year': 'int64', 'Sector': str, 'Estimated_Jobs': 'int64',
+                'Actual_Jobs': 'int64', 'Installed_Capacity_MW': 'float64'}
+
+# Rows come back in CSV order, like the pandas backend
+SELECT_COLUMNS = 'SELECT year, sector, estimated_jobs, actual_jobs, installed_capacity_mw FROM jobs'
+QUERIES = {
+    'sectors': 'SELECT sector FROM jobs GROUP BY sector ORDER BY MIN(row_order)',
+    'years': 'SELECT DISTINCT year FROM jobs ORDER BY year',
+    'all': SELECT_COLUMNS + ' ORDER BY row_order',
+    'sector': SELECT_COLUMNS + ' WHERE sector = ? ORDER BY row_order',
+    'range': SELECT_COLUMNS + ' WHERE year BETWEEN ? AND ? ORDER BY row_order',
+    'sector_range': SELECT_COLUMNS + ' WHERE sector = ? AND year BETWEEN ? AND ? ORDER BY row_order',
+    'trends': 'SELECT year, estimated_jobs, actual_jobs, installed_capacity_mw FROM jobs WHERE sector = ? ORDER BY year',
+    'trends_range': 'SELECT year, estimated_jobs, actual_jobs, installed_capacity_mw FROM jobs '
+                    'WHERE sector = ? AND year BETWEEN ? AND ? ORDER BY year'
+}
+
+def load_frame(data_path, sectors=None):
+    """The preprocessed CSV with schema types, limited to the given sectors when there are any"""
+    df = preprocess_data(data_path).astype(COLUMN_TYPES)
+    if sectors is not None:
+        df = df[df['Sector'].isin(sectors)].reset_index(drop=True)
+    return df
+
+class PandasStore:
+    """The preprocessed CSV, loaded once and indexed per sector by year"""
+
+    def __init__(self, data_path, sectors=None):
+        self.df = load_frame(data_path, sectors)
+        # Each sector's rows sorted by year, remembering their position in the CSV
+        self.index = {}
+        for sector, rows in self.df.groupby('Sector', sort=False).indices.items():
+            columns = {column: self.df[column].to_numpy()[rows] for column in self.df.columns}
+            columns['row_order'] = rows
+            self.index[sector] = TimeIndex(columns, key='Year')
+
+    def sectors(self):
+        return self.df['Sector'].unique().tolist()
+
+    def years(self):
+        return sorted(self.df['Year'].unique().tolist())
+
+    def records(self, sector=None, year=None, from_year=None, to_year=None):
+        low, high = year_bounds(year, from_year, to_year)
+        if sector:
+            indexes = [self.index[sector]] if sector in self.index else []
+        else:
+            indexes = list(self.index.values())
+        parts = [index.between(low, high) for index in indexes]
+        if not parts:
+            return []
+        # Back into CSV order, like the SQL backends
+        order = np.argsort(np.concatenate([part['row_order'] for part in parts]), kind='stable')
+        columns = list(self.df.columns)
+        values = [np.concatenate([part[column] for part in parts])[order].tolist() for column in columns]
+        return [dict(zip(columns, row)) for row in zip(*values)]
+
+    def trends(self, sector, from_year=None, to_year=None):
+        """Year-sorted columns for the sector, as views of the index arrays"""
+        if sector not in self.index:
+            return {key: np.empty(0) for key in TREND_KEYS}
+        columns = self.index[sector].between(from_year, to_year)
+        return {key: columns[column] for key, column in zip(TREND_KEYS, TREND_COLUMNS)}
+
+class SQLiteStore:
+    """Jobs data in an embedded SQLite file, queried through prepared statements"""
+
+    extension = 'sqlite'
+
+    def __init__(self, data_path, sectors=None):
+        self.data_path = data_path
+        self.sectors_kept = sectors
+        name = os.path.splitext(os.path.basename(data_path))[0]
+        if sectors is not None:
+            # A separate file per sector subset, so shards on one host do not clash
+            name += '.' + hashlib.md5('\n'.join(sorted(sectors)).encode()).hexdigest()[:8]
+        self.db_path = os.path.abspath(os.path.join(DATABASE_DIR, f'{name}.{self.extension}'))
+        self._local = threading.local()
+        if not os.path.exists(self.db_path) or os.path.getmtime(self.db_path) < os.path.getmtime(data_path):
+            self.build()
+
+    def build(self):
+        """Load the CSV into a fresh database file and swap it in atomically"""
+        df = load_frame(self.data_path, self.sectors_kept)
+        rows = [(i, int(y), str(s), int(e), int(a), float(c))
+                for i, (y, s, e, a, c) in enumerate(df[list(COLUMNS)].itertuples(index=False))]
+        tmp_path = f'{self.db_path}.{os.getpid()}.tmp'
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        connection = self._connect_writable(tmp_path)
+        try:
+            for statement in SCHEMA:
+                connection.execute(statement)
+            connection.executemany(INSERT_ROW, rows)
+            connection.commit()
+        finally:
+            connection.close()
+        os.replace(tmp_path, self.db_path)
+
+    def _connect_writable(self, path):
+        return sqlite3.connect(path)
+
+    def _connect_readonly(self):
+        connection = sqlite3.connect(f'file:{self.db_path}?mode=ro', uri=True, cached_statements=len(QUERIES) * 2)
+        connection.execute('PRAGMA query_only = ON')
+        return connection
+
+    @property
+    def connection(self):
+        # Connections must not be shared across a fork, so they are keyed on the pid
+        if getattr(self._local, 'pid', None) != os.getpid():
+            self._local.connection = self._connect_readonly()
+            self._local.pid = os.getpid()
+        return self._local.connection
+
+    def _fetch(self, query, *params):
+        return self.connection.execute(QUERIES[query], params).fetchall()
+
+    def sectors(self):
+        return [row[0] for row in self._fetch('sectors')]
+
+    def years(self):
+        return [row[0] for row in self._fetch('years')]
+
+    def records(self, sector=None, year=None, from_year=None, to_year=None):
+        low, high = year_bounds(year, from_year, to_year)
+        bounds = (YEAR_MIN if low is None else low, YEAR_MAX if high is None else high)
+        bounded = low is not None or high is not None
+        if sector:
+            rows = self._fetch('sector_range', sector, *bounds) if bounded else self._fetch('sector', sector)
+        else:
+            rows = self._fetch('range', *bounds) if bounded else self._fetch('all')
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def trends(self, sector, from_year=None, to_year=None):
+        if from_year is None and to_year is None:
+            rows = self._fetch('trends', sector)
+        else:
+            rows = self._fetch('trends_range', sector, YEAR_MIN if from_year is None else from_year,
+                               YEAR_MAX if to_year is None else to_year)
+        columns = list(zip(*rows)) if rows else [(), (), (), ()]
+        return {key: list(values) for key, values in zip(TREND_KEYS, columns)}
+
+class DuckDBStore(SQLiteStore):
+    """The same schema and queries on DuckDB's columnar engine"""
+
+    extension = 'duckdb'
+
+    def _connect_writable(self, path):
+        import duckdb
+        return duckdb.connect(path)
+
+    def _connect_readonly(self):
+        import duckdb
+        return duckdb.connect(self.db_path, read_only=True)
+
+BACKENDS = {
+    'pandas': PandasStore,
+    'sqlite': SQLiteStore,
+    'duckdb': DuckDBStore
+}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def get_store(data_path, backend=None, sectors=None):
+    """
+    Return the process-wide store for a data file, creating it on first use.
+    `sectors` optionally limits the store to those sectors' rows.
+    """
+    backend = backend or STORAGE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f'Unknown storage backend: {backend}')
+    sectors = frozenset(sectors) if sectors is not None else None
+    key = (backend, os.path.abspath(data_path), sectors)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = BACKENDS[backend](data_path, sectors)
+        return _stores[key]
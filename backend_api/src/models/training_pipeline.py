@@ -0,0 +1,230 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+import argparse
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_preprocessor import preprocess_data
+from mw_job_predictor import rebuild_stats, DEFAULT_DATA_PATH
+from compact_models import export_compact_models
+
+MODELS_DIR = os.path.dirname(os.path.abspath(__file__))
+ARTIFACTS_DIR = os.path.join(MODELS_DIR, 'artifacts')
+
+# Bump when the training code changes so every artifact is rebuilt
+PIPELINE_VERSION = 1
+
+COLUMNS = ['Year', 'Sector', 'Estimated_Jobs', 'Actual_Jobs', 'Installed_Capacity_MW']
+GLOBAL_KEY = '__all__'
+
+def content_hash(kind, df):
+    """Hash the rows a model is trained on, together with the pipeline version"""
+    digest = hashlib.sha256(f'{kind}:{PIPELINE_VERSION}:'.encode())
+    digest.update(df[COLUMNS].sort_values(['Sector', 'Year']).to_csv(index=False).encode())
+    return digest.hexdigest()
+
+def regression_metrics(actual, predicted):
+    actual = np.asarray(actual, dtype=float)
+    predicted = np.asarray(predicted, dtype=float)
+    errors = predicted - actual
+    nonzero = actual != 0
+    total = np.sum((actual - actual.mean()) ** 2)
+    return {
+        'n_samples': int(len(actual)),
+        'mae': round(float(np.mean(np.abs(errors))), 2),
+        'mape': round(float(np.mean(np.abs(errors[nonzero] / actual[nonzero])) * 100), 2) if nonzero.any() else None,
+        'r2': round(float(1 - np.sum(errors ** 2) / total), 4) if total > 0 else None
+    }
+
+def linear_regression_features(df):
+    df_encoded = pd.get_dummies(df, columns=['Sector'], drop_first=True)
+    feature_columns = ['Year', 'Installed_Capacity_MW'] + [col for col in df_encoded.columns if 'Sector_' in col]
+    return df_encoded[feature_columns].astype(float)
+
+def fit_prophet(df):
+    import logging
+    from prophet import Prophet
+    logging.getLogger('cmdstanpy').setLevel(logging.WARNING)
+
+    history = pd.DataFrame({
+        'ds': pd.to_datetime(df['Year'].astype(int).astype(str) + '-12-31'),
+        'y': df['Actual_Jobs'].astype(float).values,
+        'Installed_Capacity_MW': df['Installed_Capacity_MW'].astype(float).values
+    })
+    model = Prophet()
+    model.add_regressor('Installed_Capacity_MW')
+    model.fit(history)
+    predicted = model.predict(history.drop(columns=['y']))['yhat'].values
+    return model, predicted
+
+def fit_mw_regression(df):
+    from sklearn.linear_model import LinearRegression
+    model = LinearRegression().fit(df[['Installed_Capacity_MW']], df['Actual_Jobs'])
+    return model, model.predict(df[['Installed_Capacity_MW']])
+
+def fit_linear_regression(df):
+    from sklearn.linear_model import LinearRegression
+    X = linear_regression_features(df)
+    model = LinearRegression().fit(X, df['Actual_Jobs'])
+    return model, model.predict(X)
+
+TRAINERS = {
+    'prophet': fit_prophet,
+    'mw_regression': fit_mw_regression,
+    'linear_regression': fit_linear_regression
+}
+
+def train_task(kind, key, records, artifact_path):
+    """Fit one model in a worker process and write its artifact"""
+    df = pd.DataFrame.from_records(records)
+    started = time.perf_counter()
+    model, predicted = TRAINERS[kind](df)
+    fit_seconds = time.perf_counter() - started
+
+    os.makedirs(os.path.dirname(artifact_path), exist_ok=True)
+    payload = pickle.dumps(model)
+    with open(artifact_path, 'wb') as f:
+        f.write(payload)
+
+    metrics = regression_metrics(df['Actual_Jobs'], predicted)
+    metrics['fit_seconds'] = round(fit_seconds, 3)
+    metrics['artifact_bytes'] = len(payload)
+    return kind, key, metrics
+
+def load_manifest(artifacts_dir):
+    manifest_path = os.path.join(artifacts_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    return {'pipeline_version': PIPELINE_VERSION, 'models': {}}
+
+def save_manifest(manifest, artifacts_dir):
+    os.makedirs(artifacts_dir, exist_ok=True)
+    manifest_path = os.path.join(artifacts_dir, 'manifest.json')
+    with open(manifest_path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(manifest_path + '.tmp', manifest_path)
+
+def plan_tasks(df, kinds):
+    """Yield (kind, key, training frame) for every model the pipeline owns"""
+    for kind in kinds:
+        if kind == 'linear_regression':
+            yield kind, GLOBAL_KEY, df
+        else:
+            for sector in sorted(df['Sector'].unique()):
+                yield kind, sector, df[df['Sector'] == sector].sort_values('Year')
+
+def publish(manifest, artifacts_dir, models_dir, data_path):
+    """Combine the current per-sector artifacts into the pickles the API serves"""
+    import joblib
+
+    def load_artifact(entry):
+        with open(os.path.join(artifacts_dir, entry['artifact']), 'rb') as f:
+            return pickle.load(f)
+
+    entries = manifest['models']
+    if 'prophet' in entries:
+        prophet_models = {sector: load_artifact(entry) for sector, entry in entries['prophet'].items()}
+        with open(os.path.join(models_dir, 'prophet_models.pkl'), 'wb') as f:
+            pickle.dump(prophet_models, f)
+    if 'mw_regression' in entries:
+        mw_models = {sector: load_artifact(entry) for sector, entry in entries['mw_regression'].items()}
+        joblib.dump(mw_models, os.path.join(models_dir, 'mw_job_predictors.pkl'))
+        # Online observations live in their own runtime file and are left as they are
+        rebuild_stats(data_path, os.path.join(models_dir, 'mw_job_stats.json'))
+    if GLOBAL_KEY in entries.get('linear_regression', {}):
+        with open(os.path.join(models_dir, 'linear_regression_model.pkl'), 'wb') as f:
+            pickle.dump(load_artifact(entries['linear_regression'][GLOBAL_KEY]), f)
+    export_compact_models(models_dir, os.path.join(models_dir, 'compact_models.json'))
+
+def run_pipeline(data_path=DEFAULT_DATA_PATH, kinds=tuple(TRAINERS), workers=None,
+                 artifacts_dir=ARTIFACTS_DIR, models_dir=MODELS_DIR, force=False):
+    """
+    Fit every sector's models in parallel, skipping those whose training data
+    has not changed since the artifact recorded in the manifest.
+    """
+    df = preprocess_data(data_path)
+    manifest = load_manifest(artifacts_dir)
+    if manifest.get('pipeline_version') != PIPELINE_VERSION:
+        manifest = {'pipeline_version': PIPELINE_VERSION, 'models': {}}
+
+    pending = []
+    skipped = []
+    planned = {kind: set() for kind in kinds}
+    for kind, key, task_df in plan_tasks(df, kinds):
+        planned[kind].add(key)
+        digest = content_hash(kind, task_df)
+        entry = manifest['models'].get(kind, {}).get(key)
+        if (not force and entry and entry['hash'] == digest
+                and os.path.exists(os.path.join(artifacts_dir, entry['artifact']))):
+            skipped.append((kind, key))
+            continue
+        version = entry['version'] + 1 if entry else 1
+        artifact = os.path.join(kind, f'{key}-v{version}-{digest[:12]}.pkl')
+        records = task_df[COLUMNS].to_dict('records')
+        pending.append((kind, key, digest, version, artifact, records))
+
+    # Drop models for sectors that are no longer in the data
+    dropped = []
+    for kind in kinds:
+        for key in list(manifest['models'].get(kind, {})):
+            if key not in planned[kind]:
+                del manifest['models'][kind][key]
+                dropped.append((kind, key))
+
+    trained_at = datetime.now(timezone.utc).isoformat()
+    if pending:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(train_task, kind, key, records, os.path.join(artifacts_dir, artifact)): (digest, version, artifact)
+                for kind, key, digest, version, artifact, records in pending
+            }
+            failure = None
+            for future, (digest, version, artifact) in futures.items():
+                try:
+                    kind, key, metrics = future.result()
+                except Exception as e:
+                    failure = failure or e
+                    continue
+                manifest['models'].setdefault(kind, {})[key] = {
+                    'hash': digest,
+                    'version': version,
+                    'artifact': artifact,
+                    'trained_at': trained_at,
+                    'metrics': metrics
+                }
+                print(f"Trained {kind} model for {key} (v{version}): {metrics}")
+        if failure is not None:
+            # Keep the models that did train, so the next run only retries the failures
+            save_manifest(manifest, artifacts_dir)
+            raise failure
+
+    save_manifest(manifest, artifacts_dir)
+    # Dropped sectors must also leave the served models, even with nothing to train
+    if pending or dropped or force:
+        publish(manifest, artifacts_dir, models_dir, data_path)
+
+    for kind, key in skipped:
+        print(f"Skipped {kind} model for {key}: inputs unchanged")
+    for kind, key in dropped:
+        print(f"Dropped {kind} model for {key}: sector no longer in the data")
+    return {'trained': [(kind, key) for kind, key, *_ in pending], 'skipped': skipped, 'dropped': dropped}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Train the per-sector job prediction models')
+    parser.add_argument('--data', default=DEFAULT_DATA_PATH, help='CSV with the jobs data')
+    parser.add_argument('--models', nargs='+', choices=list(TRAINERS), default=list(TRAINERS), help='Model kinds to train')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (defaults to CPU count)')
+    parser.add_argument('--artifacts-dir', default=ARTIFACTS_DIR, help='Where versioned artifacts and the manifest live')
+    parser.add_argument('--output-dir', default=MODELS_DIR, help='Where the served model pickles are written')
+    parser.add_argument('--force', action='store_true', help='Retrain even if inputs are unchanged')
+    args = parser.parse_args()
+
+    summary = run_pipeline(args.data, args.models, args.workers, args.artifacts_dir, args.output_dir, args.force)
+    print(f"Training pipeline finished: {len(summary['trained'])} trained, {len(summary['skipped'])} skipped.")
@@ -1,7 +1,49 @@
+import os
+import sqlite3
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
 
 db = SQLAlchemy()
 
+# Runtime data, never the committed database/app.db: USER_DB_PATH if set,
+# else users.db in the app's instance folder
+DATABASE_PATH = os.environ.get('USER_DB_PATH')
+
+# SQLite runs in WAL mode so readers never wait behind the writer, and the
+# pool keeps a few connections open per worker instead of reconnecting on
+# every request. busy_timeout lets a second writer queue briefly rather than
+# fail with "database is locked".
+ENGINE_OPTIONS = {
+    'pool_size': int(os.environ.get('USER_DB_POOL_SIZE', 5)),
+    'max_overflow': int(os.environ.get('USER_DB_MAX_OVERFLOW', 10)),
+    'pool_timeout': 30,
+    'pool_pre_ping': True,
+    'connect_args': {'timeout': 15, 'check_same_thread': False}
+}
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA busy_timeout=15000')
+    cursor.execute('PRAGMA foreign_keys=ON')
+    cursor.close()
+
+def init_db(app, database_path=DATABASE_PATH):
+    """Bind the user store to an app with the pooled WAL configuration"""
+    if database_path is None:
+        os.makedirs(app.instance_path, exist_ok=True)
+        database_path = os.path.join(app.instance_path, 'users.db')
+    app.config.setdefault('SQLALCHEMY_DATABASE_URI', f'sqlite:///{os.path.abspath(database_path)}')
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', ENGINE_OPTIONS)
+    db.init_app(app)
+    with app.app_context():
+        # Only this engine gets the pragmas, not every engine in the process
+        event.listen(db.engine, 'connect', set_sqlite_pragmas)
+        db.create_all()
+
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
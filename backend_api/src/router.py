@@ -0,0 +1,197 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, request
+from flask_cors import CORS
+
+# Allow `python src/router.py` as well as `python -m src.router`
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from src.models.sharding import HashRing, SHARD_NODES
+from src.models.serialization import use_numpy_json
+from src.models.admission import trust_proxies
+
+# Thin router in front of sector shards. /trends, /insights, /predict and
+# single-sector /data go to the shard that owns the sector; /sectors, /years,
+# /data and multi-sector /trajectory fan out and merge. Each shard is the
+# routes/jobs.py blueprint running with SHARD_NODE set, see models/sharding.py.
+#
+# Local test setup, from backend_api/:
+#   python -m src.router --spawn 3
+# starts three shards on ports 5101-5103 and the router on 5100.
+FORWARD_TIMEOUT = float(os.environ.get('SHARD_FORWARD_TIMEOUT', 30))
+
+app = Flask(__name__)
+use_numpy_json(app)
+trust_proxies(app)
+CORS(app)
+
+RING = HashRing(SHARD_NODES) if SHARD_NODES else None
+_pool = ThreadPoolExecutor(max_workers=16)
+
+def client_headers():
+    """
+    Headers that let shards apply admission control to the original client.
+    The router appends the address it resolved, so shards trust one hop.
+    """
+    forwarded = request.headers.get('X-Forwarded-For')
+    headers = {'X-Forwarded-For': f'{forwarded}, {request.remote_addr}' if forwarded else request.remote_addr or ''}
+    if request.headers.get('X-API-Key'):
+        headers['X-API-Key'] = request.headers['X-API-Key']
+    return headers
+
+def forward(node, path, args=None, body=None, headers=None):
+    """Send a request to one shard and return (json, status)"""
+    url = f'{node}/api/jobs{path}'
+    if args:
+        url += '?' + urllib.parse.urlencode(args, doseq=True)
+    data = json.dumps(body).encode() if body is not None else None
+    shard_request = urllib.request.Request(url, data=data, method='POST' if data is not None else 'GET',
+                                           headers={'Content-Type': 'application/json', **(headers or {})})
+    try:
+        with urllib.request.urlopen(shard_request, timeout=FORWARD_TIMEOUT) as response:
+            return json.loads(response.read()), response.status
+    except urllib.error.HTTPError as e:
+        try:
+            return json.loads(e.read()), e.code
+        except ValueError:
+            return {'error': f'Shard {node} returned HTTP {e.code}'}, e.code
+    except (urllib.error.URLError, OSError) as e:
+        return {'error': f'Shard {node} unavailable: {e}'}, 502
+
+def fan_out(calls):
+    """Run (node, path, args, body) calls concurrently; returns results in order"""
+    headers = client_headers()
+    return list(_pool.map(lambda call: forward(*call, headers=headers), calls))
+
+def first_error(results):
+    for body, status in results:
+        if status >= 400:
+            return body, status
+    return None
+
+@app.route('/api/jobs/sectors')
+def get_sectors():
+    results = fan_out([(node, '/sectors', None, None) for node in RING.nodes])
+    error = first_error(results)
+    if error:
+        return error
+    return {'sectors': [sector for body, _ in results for sector in body['sectors']]}
+
+@app.route('/api/jobs/years')
+def get_years():
+    results = fan_out([(node, '/years', None, None) for node in RING.nodes])
+    error = first_error(results)
+    if error:
+        return error
+    return {'years': sorted({year for body, _ in results for year in body['years']})}
+
+@app.route('/api/jobs/data')
+def get_data():
+    args = request.args.to_dict(flat=False)
+    sector = request.args.get('sector')
+    if sector:
+        return forward(RING.node_for(sector), '/data', args, headers=client_headers())
+    results = fan_out([(node, '/data', args, None) for node in RING.nodes])
+    error = first_error(results)
+    if error:
+        return error
+    return [record for body, _ in results for record in body]
+
+@app.route('/api/jobs/trends')
+@app.route('/api/jobs/insights')
+def get_sector_resource():
+    sector = request.args.get('sector')
+    if not sector:
+        return {'error': 'Sector parameter is required'}, 400
+    return forward(RING.node_for(sector), request.path[len('/api/jobs'):], request.args.to_dict(flat=False),
+                   headers=client_headers())
+
+@app.route('/api/jobs/predict', methods=['POST'])
+def predict_jobs():
+    data = request.get_json(silent=True) or {}
+    if not data.get('sector'):
+        return {'error': 'Sector and year are required'}, 400
+    return forward(RING.node_for(data['sector']), '/predict', body=data, headers=client_headers())
+
+@app.route('/api/jobs/trajectory', methods=['POST'])
+def predict_trajectory():
+    data = request.get_json(silent=True) or {}
+    sectors = data.get('sectors') or ([data['sector']] if data.get('sector') else [])
+    if not sectors:
+        return {'error': 'Sectors, from_year and to_year are required'}, 400
+    if not isinstance(sectors, list) or not all(isinstance(sector, str) for sector in sectors):
+        return {'error': 'sectors must be a list of sector names'}, 400
+
+    groups = RING.assign(sectors)
+    results = fan_out([(node, '/trajectory', None, {**data, 'sector': None, 'sectors': group})
+                       for node, group in groups.items()])
+    error = first_error(results)
+    if error:
+        return error
+    return merge_trajectories([body for body, _ in results], data.get('model_type', 'linear_regression'))
+
+def merge_trajectories(bodies, requested_model_type):
+    """
+    One trajectory response from the shards' answers. Each shard admits and
+    may degrade on its own, so the served model is reported per sector, and
+    the response is degraded if any shard's part was.
+    """
+    merged = {key: value for key, value in bodies[0].items() if key not in ('degraded_reason', 'requested_model_type')}
+    merged['predictions'] = {sector: prediction for body in bodies for sector, prediction in body['predictions'].items()}
+    merged['model_types'] = {sector: body['model_type'] for body in bodies for sector in body['predictions']}
+    served = set(merged['model_types'].values())
+    merged['model_type'] = served.pop() if len(served) == 1 else 'mixed'
+    merged['degraded'] = any(body.get('degraded') for body in bodies)
+    if merged['degraded']:
+        reasons = sorted({body['degraded_reason'] for body in bodies if body.get('degraded_reason')})
+        merged.update({'degraded_reason': ', '.join(reasons), 'requested_model_type': requested_model_type})
+    return merged
+
+def create_shard_app():
+    """The jobs blueprint on its own, serving the sectors SHARD_NODE owns"""
+    from src.routes.jobs import jobs_bp
+    shard = Flask(__name__)
+    shard.register_blueprint(jobs_bp, url_prefix='/api/jobs')
+    return trust_proxies(shard)
+
+def spawn_shards(count, base_port, host='127.0.0.1'):
+    nodes = [f'http://{host}:{base_port + i}' for i in range(count)]
+    processes = []
+    for i, node in enumerate(nodes):
+        env = dict(os.environ, SHARD_NODES=','.join(nodes), SHARD_NODE=node, TRUSTED_PROXY_HOPS='1')
+        processes.append(subprocess.Popen(
+            [sys.executable, '-m', 'src.router', '--shard', '--port', str(base_port + i)],
+            cwd=os.path.join(os.path.dirname(__file__), '..'), env=env))
+    return nodes, processes
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sector shard router')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5100)))
+    parser.add_argument('--shard', action='store_true', help='Run as a shard instead of the router')
+    parser.add_argument('--spawn', type=int, default=0, help='Start this many local shards first')
+    parser.add_argument('--base-port', type=int, default=5101)
+    args = parser.parse_args()
+
+    if args.shard:
+        create_shard_app().run(host='127.0.0.1', port=args.port)
+        sys.exit(0)
+
+    processes = []
+    if args.spawn:
+        nodes, processes = spawn_shards(args.spawn, args.base_port)
+        RING = HashRing(nodes)
+    if RING is None:
+        parser.error('Set SHARD_NODES or pass --spawn')
+    print(f"Routing to shards: {', '.join(RING.nodes)}")
+    try:
+        app.run(host='0.0.0.0', port=args.port)
+    finally:
+        for process in processes:
+            process.terminate()
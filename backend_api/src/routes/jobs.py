@@ -1,34 +1,84 @@
 from flask import Blueprint, jsonify, request
-import pandas as pd
-import pickle
 import numpy as np
 from datetime import datetime
 import os
+import pandas as pd
+from src.models.compact_models import load_compact_models, predict_linear_regression, predict_prophet, year_end_dates
+from src.models.storage import get_store
+from src.models.sharding import owned_sectors, owns_sector, shard_for
+from src.models.admission import COSTS, admit, client_id, inference_budget, retry_after
+from src.models.shared_cache import cache_key, get_json, set_json
+from src.models.downsampling import downsample_series, MIN_POINTS
+from src.models.serialization import use_numpy_json
 
 jobs_bp = Blueprint('jobs', __name__)
+# Handlers return NumPy arrays as they are; the app encodes them directly
+jobs_bp.record_once(lambda state: use_numpy_json(state.app))
 
 # Load data
 DATA_PATH = os.path.join(os.path.dirname(__file__), '..', 'data', 'india_jobs_data.csv')
 MODELS_PATH = os.path.join(os.path.dirname(__file__), '..', 'models')
 
+_shard_sectors = {}
+
+def shard_sectors():
+    # Only the Sector column is read to decide ownership; None when not sharded
+    if 'sectors' not in _shard_sectors:
+        _shard_sectors['sectors'] = owned_sectors(pd.read_csv(DATA_PATH, usecols=['Sector'])['Sector'].unique())
+    return _shard_sectors['sectors']
+
 def load_data():
-    return pd.read_csv(DATA_PATH)
+    # Backend chosen by JOBS_STORAGE_BACKEND, see models/storage.py. In sharded
+    # mode the store only holds this node's sectors.
+    return get_store(DATA_PATH, sectors=shard_sectors())
+
+def load_models():
+    # In sharded mode only this node's per-sector models are kept in memory
+    return load_compact_models(os.path.join(MODELS_PATH, 'compact_models.json'), keep=shard_sectors())
+
+def models_version():
+    # Cached predictions are dropped whenever the compact models are re-exported
+    return str(os.path.getmtime(os.path.join(MODELS_PATH, 'compact_models.json')))
 
 def load_linear_regression_model():
-    with open(os.path.join(MODELS_PATH, 'linear_regression_model.pkl'), 'rb') as f:
-        return pickle.load(f)
+    return load_models()['linear_regression']
 
 def load_prophet_models():
-    with open(os.path.join(MODELS_PATH, 'prophet_models.pkl'), 'rb') as f:
-        return pickle.load(f)
+    return load_models()['prophet']
+
+def misdirected(sectors):
+    """421 response for sectors another shard owns, naming the owners"""
+    return jsonify({
+        'error': 'Sector is served by another shard',
+        'shards': {sector: shard_for(sector) for sector in sectors}
+    }), 421
+
+def throttled(cost):
+    """429 for a client that cannot afford even the cheapest answer"""
+    seconds = retry_after(cost)
+    return jsonify({'error': 'Rate limit exceeded', 'retry_after': seconds}), 429, {'Retry-After': str(seconds)}
+
+def year_range():
+    """Inclusive from_year/to_year query parameters, either of which may be omitted"""
+    from_year = request.args.get('from_year', type=int)
+    to_year = request.args.get('to_year', type=int)
+    if from_year is not None and to_year is not None and from_year > to_year:
+        raise ValueError('from_year must not be after to_year')
+    return from_year, to_year
+
+@jobs_bp.before_request
+def admit_metadata():
+    # Inference endpoints are admitted per model inside their handlers
+    if request.endpoint in ('jobs.predict_jobs', 'jobs.predict_trajectory'):
+        return None
+    if not admit(client_id(request), COSTS['metadata']):
+        return throttled(COSTS['metadata'])
 
 @jobs_bp.route('/sectors', methods=['GET'])
 def get_sectors():
     """Get all available sectors"""
     try:
-        df = load_data()
-        sectors = df['Sector'].unique().tolist()
-        return jsonify({'sectors': sectors})
+        return jsonify({'sectors': load_data().sectors()})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -36,51 +86,51 @@ def get_sectors():
 def get_years():
     """Get all available years"""
     try:
-        df = load_data()
-        years = sorted(df['Year'].unique().tolist())
+        years = load_data().years()
         return jsonify({'years': years})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @jobs_bp.route('/data', methods=['GET'])
 def get_data():
-    """Get employment data for a specific sector and year"""
+    """Get employment data for a specific sector and year or year range"""
     try:
         sector = request.args.get('sector')
         year = request.args.get('year', type=int)
+        try:
+            from_year, to_year = year_range()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        df = load_data()
-        
-        if sector and year:
-            filtered_df = df[(df['Sector'] == sector) & (df['Year'] == year)]
-        elif sector:
-            filtered_df = df[df['Sector'] == sector]
-        elif year:
-            filtered_df = df[df['Year'] == year]
-        else:
-            filtered_df = df
-        
-        return jsonify(filtered_df.to_dict('records'))
+        if sector and not owns_sector(sector):
+            return misdirected([sector])
+        return jsonify(load_data().records(sector, year, from_year, to_year))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @jobs_bp.route('/trends', methods=['GET'])
 def get_trends():
-    """Get trend data for a specific sector"""
+    """Get trend data for a specific sector, optionally within a year range"""
     try:
         sector = request.args.get('sector')
         if not sector:
             return jsonify({'error': 'Sector parameter is required'}), 400
         
-        df = load_data()
-        sector_df = df[df['Sector'] == sector].sort_values('Year')
+        max_points = request.args.get('max_points', type=int)
+        if max_points is not None and max_points < MIN_POINTS:
+            return jsonify({'error': f'max_points must be at least {MIN_POINTS}'}), 400
+        try:
+            from_year, to_year = year_range()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        trends = {
-            'years': sector_df['Year'].tolist(),
-            'estimated_jobs': sector_df['Estimated_Jobs'].tolist(),
-            'actual_jobs': sector_df['Actual_Jobs'].tolist(),
-            'installed_capacity': sector_df['Installed_Capacity_MW'].tolist()
-        }
+        if not owns_sector(sector):
+            return misdirected([sector])
+        
+        trends = load_data().trends(sector, from_year, to_year)
+        if max_points is not None:
+            # Series here come from the store per request, so they are downsampled on the fly
+            trends = downsample_series(trends, max_points)
         
         return jsonify(trends)
     except Exception as e:
@@ -99,72 +149,137 @@ def predict_jobs():
         if not sector or not year:
             return jsonify({'error': 'Sector and year are required'}), 400
         
-        df = load_data()
+        if not owns_sector(sector):
+            return misdirected([sector])
         
-        if model_type == 'linear_regression':
-            # Load linear regression model
-            model = load_linear_regression_model()
-            
-            # Prepare input data
-            df_encoded = pd.get_dummies(df, columns=['Sector'], drop_first=True)
-            feature_columns = ['Year', 'Installed_Capacity_MW'] + [col for col in df_encoded.columns if 'Sector_' in col]
-            
-            # Create input vector
-            input_data = pd.DataFrame({
-                'Year': [year],
-                'Installed_Capacity_MW': [installed_capacity]
-            })
-            
-            # Add sector dummy variables
-            for col in feature_columns:
-                if col.startswith('Sector_'):
-                    sector_name = col.replace('Sector_', '')
-                    input_data[col] = [1 if sector == sector_name else 0]
-                elif col not in input_data.columns:
-                    input_data[col] = [0]
-            
-            # Ensure columns are in the same order as training
-            input_data = input_data[feature_columns]
-            
-            prediction = model.predict(input_data)[0]
-            
-        elif model_type == 'prophet':
-            # Load Prophet models
-            prophet_models = load_prophet_models()
-            
-            if sector not in prophet_models:
-                return jsonify({'error': f'Prophet model not available for sector: {sector}'}), 400
-            
-            model = prophet_models[sector]
-            
-            # Create future dataframe
-            future_df = pd.DataFrame({
-                'ds': [pd.to_datetime(f'{year}-12-31')],
-                'Installed_Capacity_MW': [installed_capacity]
-            })
+        if model_type not in ('linear_regression', 'prophet'):
+            return jsonify({'error': 'Invalid model type'}), 400
+        
+        key = cache_key(sector, year, installed_capacity)
+        with inference_budget(client_id(request), model_type) as (served_model, degraded):
+            if served_model is None:
+                return throttled(COSTS['linear_regression'])
             
-            forecast = model.predict(future_df)
-            prediction = forecast['yhat'].iloc[0]
+            # A heavy request turned away serves the last Prophet answer for
+            # the same inputs if there is one, and linear regression otherwise
+            cached = get_json('jobs_predict', models_version(), key) if degraded else None
+            if cached:
+                cached.update({'degraded': True, 'degraded_reason': degraded})
+                return jsonify(cached)
             
-        else:
-            return jsonify({'error': 'Invalid model type'}), 400
+            if served_model == 'linear_regression':
+                # Load linear regression model
+                model = load_linear_regression_model()
+                prediction = predict_linear_regression(model, year, installed_capacity, sector)[0]
+                
+            else:
+                # Load Prophet models
+                prophet_models = load_prophet_models()
+                
+                if sector not in prophet_models:
+                    return jsonify({'error': f'Prophet model not available for sector: {sector}'}), 400
+                
+                model = prophet_models[sector]
+                prediction = predict_prophet(model, year_end_dates(year), {'Installed_Capacity_MW': installed_capacity})[0]
         
         # Calculate growth rate if possible
-        historical_data = df[df['Sector'] == sector].sort_values('Year')
-        if len(historical_data) > 0:
-            last_year_jobs = historical_data['Actual_Jobs'].iloc[-1]
+        actual_jobs = load_data().trends(sector)['actual_jobs']
+        if len(actual_jobs) > 0:
+            last_year_jobs = actual_jobs[-1]
             growth_rate = ((prediction - last_year_jobs) / last_year_jobs) * 100
         else:
             growth_rate = 0
         
-        return jsonify({
+        response = {
             'sector': sector,
             'year': year,
             'predicted_jobs': int(prediction),
-            'model_type': model_type,
+            'model_type': served_model,
             'growth_rate': round(growth_rate, 2),
-            'installed_capacity': installed_capacity
-        })
+            'installed_capacity': installed_capacity,
+            'degraded': degraded is not None
+        }
+        if degraded:
+            response.update({'degraded_reason': degraded, 'requested_model_type': model_type})
+        elif served_model == 'prophet':
+            set_json('jobs_predict', models_version(), key, response)
+        return jsonify(response)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@jobs_bp.route('/trajectory', methods=['POST'])
+def predict_trajectory():
+    """Predict every year in a range for one or more sectors with one model call each"""
+    try:
+        data = request.get_json()
+        sectors = data.get('sectors') or ([data['sector']] if data.get('sector') else [])
+        from_year = data.get('from_year')
+        to_year = data.get('to_year')
+        installed_capacity = data.get('installed_capacity', 0)
+        model_type = data.get('model_type', 'linear_regression')
+        
+        if not sectors or from_year is None or to_year is None:
+            return jsonify({'error': 'Sectors, from_year and to_year are required'}), 400
+        if not isinstance(sectors, list) or not all(isinstance(sector, str) for sector in sectors):
+            return jsonify({'error': 'sectors must be a list of sector names'}), 400
+        
+        foreign = [sector for sector in sectors if not owns_sector(sector)]
+        if foreign:
+            return misdirected(foreign)
+        known = set(load_data().sectors())
+        unknown = [sector for sector in sectors if sector not in known]
+        if unknown:
+            return jsonify({'error': f'Sector not found: {", ".join(unknown)}'}), 404
+        
+        try:
+            years = np.arange(int(from_year), int(to_year) + 1)
+            # A scalar capacity applies to every year, a list gives one value per year
+            installed_capacity = np.asarray(installed_capacity, dtype=float)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'from_year, to_year and installed_capacity must be numbers'}), 400
+        if len(years) == 0 or len(years) > 100:
+            return jsonify({'error': 'Year range must be ascending and at most 100 years'}), 400
+        
+        if installed_capacity.ndim and installed_capacity.shape != years.shape:
+            return jsonify({'error': 'installed_capacity must be a number or one value per year'}), 400
+        capacities = np.broadcast_to(installed_capacity, years.shape)
+        
+        if model_type not in ('linear_regression', 'prophet'):
+            return jsonify({'error': 'Invalid model type'}), 400
+        
+        predictions = {}
+        with inference_budget(client_id(request), model_type, units=len(sectors)) as (served_model, degraded):
+            if served_model is None:
+                return throttled(COSTS['linear_regression'] * len(sectors))
+            
+            if served_model == 'linear_regression':
+                model = load_linear_regression_model()
+                for sector in sectors:
+                    predictions[sector] = predict_linear_regression(model, years, capacities, sector).astype(int)
+            
+            else:
+                prophet_models = load_prophet_models()
+                missing = [sector for sector in sectors if sector not in prophet_models]
+                if missing:
+                    return jsonify({'error': f'Prophet model not available for sector: {", ".join(missing)}'}), 400
+                
+                # One multi-row evaluation per sector covers the whole range
+                dates = year_end_dates(years)
+                for sector in sectors:
+                    forecast = predict_prophet(prophet_models[sector], dates, {'Installed_Capacity_MW': capacities})
+                    predictions[sector] = forecast.astype(int)
+        
+        response = {
+            'years': years,
+            'predictions': predictions,
+            'model_type': served_model,
+            'installed_capacity': capacities,
+            'degraded': degraded is not None
+        }
+        if degraded:
+            response.update({'degraded_reason': degraded, 'requested_model_type': model_type})
+        return jsonify(response)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -177,26 +292,33 @@ def get_insights():
         if not sector:
             return jsonify({'error': 'Sector parameter is required'}), 400
         
-        df = load_data()
-        sector_df = df[df['Sector'] == sector].sort_values('Year')
+        if not owns_sector(sector):
+            return misdirected([sector])
+        
+        trends = load_data().trends(sector)
         
-        if len(sector_df) == 0:
+        if len(trends['years']) == 0:
             return jsonify({'error': 'No data found for the specified sector'}), 404
         
+        years = np.asarray(trends['years'])
+        estimated_jobs = np.asarray(trends['estimated_jobs'], dtype=float)
+        actual_jobs = np.asarray(trends['actual_jobs'], dtype=float)
+        installed_capacity = np.asarray(trends['installed_capacity'], dtype=float)
+        
         # Calculate insights
-        total_growth = ((sector_df['Actual_Jobs'].iloc[-1] - sector_df['Actual_Jobs'].iloc[0]) / sector_df['Actual_Jobs'].iloc[0]) * 100
-        avg_deviation = np.mean(np.abs(sector_df['Estimated_Jobs'] - sector_df['Actual_Jobs']) / sector_df['Estimated_Jobs'] * 100)
-        capacity_correlation = np.corrcoef(sector_df['Installed_Capacity_MW'], sector_df['Actual_Jobs'])[0, 1]
+        total_growth = ((actual_jobs[-1] - actual_jobs[0]) / actual_jobs[0]) * 100
+        avg_deviation = np.mean(np.abs(estimated_jobs - actual_jobs) / estimated_jobs * 100)
+        capacity_correlation = np.corrcoef(installed_capacity, actual_jobs)[0, 1]
         
         insights = {
             'sector': sector,
             'total_growth_percentage': round(total_growth, 2),
             'average_estimation_deviation': round(avg_deviation, 2),
             'capacity_job_correlation': round(capacity_correlation, 3),
-            'years_of_data': len(sector_df),
-            'latest_year': int(sector_df['Year'].max()),
-            'latest_jobs': int(sector_df['Actual_Jobs'].iloc[-1]),
-            'latest_capacity': int(sector_df['Installed_Capacity_MW'].iloc[-1])
+            'years_of_data': len(years),
+            'latest_year': int(years.max()),
+            'latest_jobs': int(actual_jobs[-1]),
+            'latest_capacity': int(installed_capacity[-1])
         }
         
         return jsonify(insights)
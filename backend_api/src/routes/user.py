@@ -1,12 +1,93 @@
 from flask import Blueprint, jsonify, request
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from src.models.user import User, db
 
 user_bp = Blueprint('user', __name__)
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BULK_USERS = 50000
+# Stay under SQLite's bound-parameter limit when looking up existing users
+LOOKUP_CHUNK = 500
+
 @user_bp.route('/users', methods=['GET'])
 def get_users():
-    users = User.query.all()
-    return jsonify([user.to_dict() for user in users])
+    # Without a limit every user is returned, as before. With one, pages use
+    # keyset pagination on the primary key: pass the X-Next-After-Id header
+    # back as after_id to fetch the next page
+    if 'limit' not in request.args:
+        users = User.query.order_by(User.id).all()
+        return jsonify([user.to_dict() for user in users])
+    after_id = request.args.get('after_id', 0, type=int)
+    limit = max(1, min(request.args.get('limit', DEFAULT_PAGE_SIZE, type=int), MAX_PAGE_SIZE))
+    users = User.query.filter(User.id > after_id).order_by(User.id).limit(limit).all()
+    response = jsonify([user.to_dict() for user in users])
+    if len(users) == limit:
+        response.headers['X-Next-After-Id'] = str(users[-1].id)
+    return response
+
+@user_bp.route('/users/bulk', methods=['POST'])
+def bulk_upsert_users():
+    """
+    Create or update many users in one transaction. Each item needs a
+    username and email; an item with an id updates that user, otherwise a
+    user with the same username is updated or a new one is inserted.
+    """
+    items = request.json
+    if not isinstance(items, list) or not items:
+        return jsonify({'error': 'Expected a non-empty list of users'}), 400
+    if len(items) > MAX_BULK_USERS:
+        return jsonify({'error': f'At most {MAX_BULK_USERS} users per request'}), 400
+    invalid = [i for i, item in enumerate(items)
+               if not isinstance(item, dict) or not item.get('username') or not item.get('email')]
+    if invalid:
+        return jsonify({'error': 'username and email are required', 'invalid_items': invalid[:100]}), 400
+
+    explicit_ids = [item['id'] for item in items if item.get('id') is not None]
+    if any(not isinstance(user_id, int) or isinstance(user_id, bool) for user_id in explicit_ids):
+        return jsonify({'error': 'id must be an integer'}), 400
+    existing = set()
+    for start in range(0, len(explicit_ids), LOOKUP_CHUNK):
+        chunk = explicit_ids[start:start + LOOKUP_CHUNK]
+        existing.update(db.session.scalars(db.select(User.id).where(User.id.in_(chunk))))
+    unknown = sorted(set(explicit_ids) - existing)
+    if unknown:
+        return jsonify({'error': 'Unknown user ids', 'ids': unknown[:100]}), 404
+
+    ids = {}
+    usernames = [item['username'] for item in items if item.get('id') is None]
+    for start in range(0, len(usernames), LOOKUP_CHUNK):
+        chunk = usernames[start:start + LOOKUP_CHUNK]
+        rows = db.session.execute(db.select(User.id, User.username).where(User.username.in_(chunk)))
+        ids.update({username: user_id for user_id, username in rows})
+
+    inserts = []
+    updates = []
+    for item in items:
+        # An explicit null id falls back to the username lookup
+        user_id = item.get('id') or ids.get(item['username'])
+        row = {'username': item['username'], 'email': item['email']}
+        if user_id is None:
+            inserts.append(row)
+        else:
+            updates.append({'id': user_id, **row})
+
+    try:
+        if inserts:
+            db.session.execute(insert(User), inserts)
+        if updates:
+            db.session.execute(update(User), updates)
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        return jsonify({'error': 'Duplicate username or email', 'detail': str(e.orig)}), 409
+    except SQLAlchemyError as e:
+        # e.g. a user deleted by another request since the lookup above
+        db.session.rollback()
+        return jsonify({'error': 'Bulk upsert failed', 'detail': str(e)}), 409
+
+    return jsonify({'created': len(inserts), 'updated': len(updates)})
 
 @user_bp.route('/users', methods=['POST'])
 def create_user():
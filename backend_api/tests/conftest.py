@@ -0,0 +1,22 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BACKEND_DIR, 'src')
+
+# The apps import their modules as top-level names from src/ and src/models/,
+# and the blueprints as src.*
+for path in (os.path.join(SRC_DIR, 'models'), SRC_DIR, BACKEND_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# Keep test responses out of the host-wide cache a running server uses
+os.environ.setdefault('SHARED_CACHE_PATH', os.path.join(tempfile.mkdtemp(), 'cache.bin'))
+
+@pytest.fixture(scope='session')
+def client():
+    import main
+    return main.app.test_client()
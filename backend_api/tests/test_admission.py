@@ -0,0 +1,53 @@
+import multiprocessing
+
+from src.models import admission
+from src.models.admission import InferenceSlots, admit, capped, inference_budget
+
+def test_bucket_spends_and_refuses():
+    assert admit('bucket-client', 30, rate=0, burst=40)
+    assert not admit('bucket-client', 30, rate=0, burst=40)
+    assert admit('bucket-client', 10, rate=0, burst=40)
+
+def test_costs_are_capped_at_a_full_bucket():
+    assert capped(8 * 10) == admission.ADMISSION_BURST
+    assert capped(3) == 3
+
+def test_slots_are_shared_between_threads_of_one_process(tmp_path):
+    slots = InferenceSlots(2, str(tmp_path / 'slots.lock'))
+    held = [slots.try_acquire(), slots.try_acquire()]
+    assert sorted(held) == [0, 1]
+    assert slots.try_acquire() is None
+    slots.release(held[0])
+    assert slots.try_acquire() == held[0]
+
+def hold_slots(path, count, ready, done):
+    slots = InferenceSlots(count, path)
+    held = [slots.try_acquire() for _ in range(count)]
+    ready.set()
+    done.wait(10)
+    for slot in held:
+        slots.release(slot)
+
+def test_slots_are_shared_between_processes(tmp_path):
+    path = str(tmp_path / 'slots.lock')
+    context = multiprocessing.get_context('fork')
+    ready, done = context.Event(), context.Event()
+    worker = context.Process(target=hold_slots, args=(path, 2, ready, done))
+    worker.start()
+    try:
+        assert ready.wait(10)
+        assert InferenceSlots(2, path).try_acquire() is None
+    finally:
+        done.set()
+        worker.join(10)
+    assert InferenceSlots(2, path).try_acquire() is not None
+
+def test_busy_heavy_inference_degrades(tmp_path, monkeypatch):
+    slots = InferenceSlots(1, str(tmp_path / 'slots.lock'))
+    monkeypatch.setattr(admission, 'heavy_slots', lambda: slots)
+    held = slots.try_acquire()
+    with inference_budget('busy-client', 'prophet') as (model, reason):
+        assert (model, reason) == ('linear_regression', 'busy')
+    slots.release(held)
+    with inference_budget('busy-client', 'prophet') as (model, reason):
+        assert (model, reason) == ('prophet', None)
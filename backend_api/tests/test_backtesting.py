@@ -0,0 +1,21 @@
+import pandas as pd
+
+from backtesting import backtest_task, fit_jobs_per_mw, summarise
+
+def records():
+    rows = []
+    for year in range(2015, 2021):
+        rows.append({'Year': year, 'Sector': 'Solar', 'Actual_Jobs': 1000.0 * (year - 2014), 'Installed_Capacity_MW': 100.0 * (year - 2014)})
+        # No capacity until 2019
+        rows.append({'Year': year, 'Sector': 'Green Hydrogen', 'Actual_Jobs': 50.0, 'Installed_Capacity_MW': 0.0 if year < 2019 else 10.0})
+    return rows
+
+def test_jobs_per_mw_skips_sectors_without_capacity():
+    predict = fit_jobs_per_mw(pd.DataFrame.from_records(records()[:6]))
+    assert predict('Solar', 2018, 400.0) == 4000
+    assert predict('Green Hydrogen', 2018, 10.0) is None
+
+def test_backtest_task_drops_unanswered_cases():
+    result = backtest_task('jobs_per_mw', 2018, 1, records())
+    assert [p['sector'] for p in result['predictions']] == ['Solar']
+    assert summarise([result])['jobs_per_mw']['n_samples'] == 1
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from compact_models import (export_linear_regression, export_prophet, as_arrays, PROPHET_ARRAYS, LINEAR_REGRESSION_ARRAYS,
+                            linear_regression_features, predict_linear_regression, sweep_linear_regression,
+                            predict_prophet, year_end_dates, verify_compact_models)
+from data_preprocessor import preprocess_data
+from mw_job_predictor import DEFAULT_DATA_PATH
+from training_pipeline import fit_linear_regression, fit_prophet
+
+YEARS = np.arange(2010, 2041)
+CAPACITIES = np.linspace(0, 100000, len(YEARS))
+
+@pytest.fixture(scope='module')
+def df():
+    return preprocess_data(DEFAULT_DATA_PATH)
+
+def test_shipped_artifact_matches_pickles():
+    pytest.importorskip('prophet')
+    errors, failures = verify_compact_models()
+    assert errors and not failures
+
+def test_linear_regression_matches_sklearn(df):
+    model, _ = fit_linear_regression(df)
+    params = as_arrays(export_linear_regression(model), LINEAR_REGRESSION_ARRAYS)
+    for sector in df['Sector'].unique():
+        X = linear_regression_features(params, YEARS, CAPACITIES, sector)
+        expected = model.predict(pd.DataFrame(X, columns=params['feature_names']))
+        np.testing.assert_allclose(predict_linear_regression(params, YEARS, CAPACITIES, sector), expected, rtol=1e-9)
+
+def test_sweep_matches_pointwise_predictions(df):
+    model, _ = fit_linear_regression(df)
+    params = as_arrays(export_linear_regression(model), LINEAR_REGRESSION_ARRAYS)
+    sectors = ['Solar', 'Wind']
+    grid = sweep_linear_regression(params, sectors, YEARS, CAPACITIES[:3])
+    assert grid.shape == (2, len(YEARS), 3)
+    for i, sector in enumerate(sectors):
+        for k, capacity in enumerate(CAPACITIES[:3]):
+            np.testing.assert_allclose(grid[i, :, k], predict_linear_regression(params, YEARS, capacity, sector), rtol=1e-9)
+
+def test_prophet_matches_prophet(df):
+    pytest.importorskip('prophet')
+    model, _ = fit_prophet(df[df['Sector'] == 'Solar'].sort_values('Year'))
+    params = as_arrays(export_prophet(model), PROPHET_ARRAYS)
+    future = pd.DataFrame({'ds': pd.to_datetime([f'{y}-12-31' for y in YEARS]), 'Installed_Capacity_MW': CAPACITIES})
+    expected = model.predict(future)['yhat'].values
+    actual = predict_prophet(params, year_end_dates(YEARS), {'Installed_Capacity_MW': CAPACITIES})
+    np.testing.assert_allclose(actual, expected, rtol=1e-6, atol=1e-6)
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from downsampling import lttb_indices, downsample_series, build_resolutions, trend_series
+
+def series(n):
+    years = np.arange(n)
+    return {'years': years, 'actual_jobs': np.sin(years / 10.0) * 1000, 'sector': ['Solar'] * n}
+
+def test_keeps_endpoints_and_peak():
+    y = np.zeros(101)
+    y[37] = 500.0
+    indices = lttb_indices(np.arange(101), y, 10)
+    assert len(indices) == 10
+    assert indices[0] == 0 and indices[-1] == 100
+    assert 37 in indices
+    assert np.all(np.diff(indices) > 0)
+
+def test_short_series_is_unchanged():
+    assert list(lttb_indices([1, 2, 3], [1, 2, 3], 10)) == [0, 1, 2]
+
+def test_rejects_tiny_threshold():
+    with pytest.raises(ValueError):
+        lttb_indices(np.arange(10), np.arange(10), 2)
+
+def test_measures_share_indices():
+    reduced = downsample_series(series(500), 50)
+    assert len(reduced['years']) == len(reduced['actual_jobs']) == len(reduced['sector']) == 50
+    np.testing.assert_allclose(reduced['actual_jobs'], np.sin(reduced['years'] / 10.0) * 1000)
+
+def test_trend_series_picks_largest_fitting_resolution():
+    full = series(500)
+    precomputed = build_resolutions({'Solar': full})['Solar']
+    assert sorted(precomputed) == [50, 200]
+    assert trend_series(full, precomputed) is full
+    assert len(trend_series(full, precomputed, 300)['years']) == 200
+    assert len(trend_series(full, precomputed, 20)['years']) == 20
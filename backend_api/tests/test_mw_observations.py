@@ -0,0 +1,46 @@
+import math
+
+import pytest
+
+import main
+import mw_job_predictor
+from mw_job_predictor import add_observation, load_stats, read_stats, rebuild_stats, verify_stats
+
+@pytest.fixture
+def stats_files(tmp_path):
+    stats_path = str(tmp_path / 'mw_job_stats.json')
+    observations_path = str(tmp_path / 'instance' / 'mw_job_observations.json')
+    rebuild_stats(mw_job_predictor.DEFAULT_DATA_PATH, stats_path)
+    return stats_path, observations_path
+
+def test_shipped_stats_match_the_default_csv():
+    assert verify_stats(mw_job_predictor.DEFAULT_DATA_PATH) == {}
+
+def test_observations_are_kept_apart_and_survive_a_rebuild(stats_files):
+    stats_path, observations_path = stats_files
+    trained = read_stats(stats_path)['Solar']
+    add_observation('Solar', 100, 200, stats_path, observations_path)
+    assert read_stats(stats_path)['Solar'] == trained
+    assert load_stats(stats_path, observations_path)['Solar']['n'] == trained['n'] + 1
+    assert verify_stats(mw_job_predictor.DEFAULT_DATA_PATH, stats_path=stats_path) == {}
+
+    rebuild_stats(mw_job_predictor.DEFAULT_DATA_PATH, stats_path)
+    assert load_stats(stats_path, observations_path)['Solar']['n'] == trained['n'] + 1
+
+@pytest.mark.parametrize('sector, mw_capacity, actual_jobs', [
+    ('Solar', math.nan, 1), ('Solar', 1, math.inf), ('Solar', 'nan', 1), ('Nonexistent', 1, 1)
+])
+def test_invalid_observations_are_rejected(stats_files, sector, mw_capacity, actual_jobs):
+    stats_path, observations_path = stats_files
+    with pytest.raises(ValueError):
+        add_observation(sector, mw_capacity, actual_jobs, stats_path, observations_path)
+
+def test_endpoint_needs_the_admin_token(client, monkeypatch):
+    body = {'sector': 'Solar', 'mw_capacity': 100, 'actual_jobs': 200}
+    monkeypatch.setattr(main, 'OBSERVATIONS_TOKEN', None)
+    assert client.post('/api/jobs/predict-mw/observations', json=body).status_code == 403
+
+    monkeypatch.setattr(main, 'OBSERVATIONS_TOKEN', 'secret')
+    assert client.post('/api/jobs/predict-mw/observations', json=body, headers={'X-Admin-Token': 'wrong'}).status_code == 403
+    assert client.post('/api/jobs/predict-mw/observations', json={**body, 'sector': 'Nonexistent'},
+                       headers={'X-Admin-Token': 'secret'}).status_code == 400
@@ -0,0 +1,25 @@
+import main
+
+def latest_year(sector='Solar'):
+    return main.SAMPLE_DATA['data'][sector]['years'][-1]
+
+def test_uncertainty_horizon_is_bounded(client):
+    year = latest_year() + main.MAX_TRAJECTORY_YEARS + 1
+    response = client.post('/api/jobs/predict', json={'sector': 'Solar', 'year': year, 'uncertainty': True, 'samples': 10000})
+    assert response.status_code == 400
+
+def test_uncertainty_within_horizon(client):
+    year = latest_year() + main.MAX_TRAJECTORY_YEARS
+    response = client.post('/api/jobs/predict', json={'sector': 'Solar', 'year': year, 'uncertainty': True, 'samples': 100})
+    assert response.status_code == 200
+    assert response.json['uncertainty']['samples'] == 100
+
+def test_point_forecast_has_no_horizon_limit(client):
+    response = client.post('/api/jobs/predict', json={'sector': 'Solar', 'year': 12023})
+    assert response.status_code == 200
+
+def test_invalid_year_and_samples(client):
+    assert client.post('/api/jobs/predict', json={'sector': 'Solar', 'year': '2030'}).status_code == 400
+    for samples in ('abc', [1], {'n': 1}, 0, True):
+        response = client.post('/api/jobs/predict', json={'sector': 'Solar', 'year': 2030, 'samples': samples})
+        assert response.status_code == 400
@@ -0,0 +1,23 @@
+from src.router import merge_trajectories
+
+def shard_body(sectors, model_type, reason=None):
+    body = {'years': [2030], 'predictions': {sector: [1] for sector in sectors}, 'model_type': model_type,
+            'installed_capacity': [0], 'degraded': reason is not None}
+    if reason:
+        body.update({'degraded_reason': reason, 'requested_model_type': 'prophet'})
+    return body
+
+def test_merge_reports_degradation_from_any_shard():
+    merged = merge_trajectories([shard_body(['Solar'], 'prophet'), shard_body(['Wind'], 'linear_regression', 'busy')], 'prophet')
+    assert merged['degraded'] is True
+    assert merged['degraded_reason'] == 'busy'
+    assert merged['requested_model_type'] == 'prophet'
+    assert merged['model_type'] == 'mixed'
+    assert merged['model_types'] == {'Solar': 'prophet', 'Wind': 'linear_regression'}
+    assert sorted(merged['predictions']) == ['Solar', 'Wind']
+
+def test_merge_of_undegraded_shards():
+    merged = merge_trajectories([shard_body(['Solar'], 'prophet'), shard_body(['Wind'], 'prophet')], 'prophet')
+    assert merged['degraded'] is False
+    assert merged['model_type'] == 'prophet'
+    assert 'degraded_reason' not in merged
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from shared_cache import SharedMemoryCache, layout_path
+
+def test_round_trip(tmp_path):
+    cache = SharedMemoryCache(str(tmp_path / 'cache.bin'), buckets=4, ways=2, slot_bytes=256)
+    assert cache.set('trends', 'v1', 'Solar', b'payload')
+    assert cache.get('trends', 'v1', 'Solar') == b'payload'
+    assert cache.get('trends', 'v2', 'Solar') is None
+    assert not cache.set('trends', 'v1', 'Wind', bytes(512))
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = SharedMemoryCache(str(tmp_path / 'cache.bin'), buckets=1, ways=2, slot_bytes=128)
+    cache.set('n', 'v', 'a', b'a')
+    cache.set('n', 'v', 'b', b'b')
+    cache.get('n', 'v', 'a')
+    cache.set('n', 'v', 'c', b'c')
+    assert cache.get('n', 'v', 'a') == b'a'
+    assert cache.get('n', 'v', 'b') is None
+
+def test_new_layout_uses_its_own_file(tmp_path):
+    path = str(tmp_path / 'cache.bin')
+    old = SharedMemoryCache(path, buckets=8, ways=2, slot_bytes=256)
+    old.set('n', 'v', 'key', b'old')
+    new = SharedMemoryCache(path, buckets=2, ways=2, slot_bytes=128)
+
+    assert new.path != old.path
+    assert os.path.getsize(old.path) == old.size
+    # The old mapping is untouched, so live workers keep reading it
+    assert old.get('n', 'v', 'key') == b'old'
+    assert new.get('n', 'v', 'key') is None
+
+def test_same_layout_shares_entries(tmp_path):
+    path = str(tmp_path / 'cache.bin')
+    first = SharedMemoryCache(path, buckets=4, ways=2, slot_bytes=256)
+    first.set('n', 'v', 'key', b'shared')
+    assert SharedMemoryCache(path, buckets=4, ways=2, slot_bytes=256).get('n', 'v', 'key') == b'shared'
+
+def test_foreign_file_is_not_truncated(tmp_path):
+    path = str(tmp_path / 'cache.bin')
+    target = layout_path(path, 4, 2, 256)
+    with open(target, 'wb') as f:
+        f.write(b'not a cache table' * 10)
+    with pytest.raises(ValueError):
+        SharedMemoryCache(path, buckets=4, ways=2, slot_bytes=256)
+    assert os.path.getsize(target) == 170
+
+def test_backends_default_to_separate_files():
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    paths = []
+    for module in ('backend_api/src/models/shared_cache.py', 'backend_final/src/shared_cache.py'):
+        with open(os.path.join(root, module)) as f:
+            paths.append(next(line for line in f if line.startswith('CACHE_PATH')))
+    assert paths[0] != paths[1]
@@ -0,0 +1,43 @@
+import math
+
+import numpy as np
+import pytest
+
+from main import MAX_SWEEP_CELLS, parse_range
+
+def test_parse_range_lists_and_ranges():
+    assert parse_range([1, 2.5], 'x').tolist() == [1.0, 2.5]
+    assert parse_range({'start': 0, 'stop': 10, 'step': 5}, 'x').tolist() == [0.0, 5.0, 10.0]
+    assert parse_range({'start': 0, 'stop': 0.3, 'step': 0.1}, 'x').size == 4
+
+@pytest.mark.parametrize('spec', [
+    {'start': 0, 'stop': 'inf'},
+    {'start': '-inf', 'stop': 0},
+    {'start': 0, 'stop': 'nan'},
+    {'start': 0, 'stop': 1, 'step': 'nan'},
+    {'start': -1e308, 'stop': 1e308, 'step': 1e-300},
+    {'start': 0, 'stop': MAX_SWEEP_CELLS},
+    {'start': 0, 'stop': 1, 'step': 0},
+    {'start': 1, 'stop': 0},
+    [1, math.nan],
+    [1, math.inf],
+    [[1, 2], [3, 4]],
+    ['a'],
+])
+def test_parse_range_rejects(spec):
+    with pytest.raises(ValueError):
+        parse_range(spec, 'x')
+
+@pytest.mark.parametrize('mw_capacity', [{'start': 0, 'stop': 'inf'}, ['nan'], {'start': 0, 'stop': 1e308, 'step': 1e-300}, 'abc'])
+def test_sweep_rejects_bad_ranges(client, mw_capacity):
+    assert client.post('/api/jobs/sweep', json={'sectors': ['Solar'], 'mw_capacity': mw_capacity}).status_code == 400
+
+def test_sweep_rejects_string_sectors(client):
+    assert client.post('/api/jobs/sweep', json={'sectors': 'Solar', 'mw_capacity': [1]}).status_code == 400
+
+def test_sweep_grids_are_clamped_at_zero(client):
+    for body in ({'sectors': ['Solar'], 'mw_capacity': [-1e7]},
+                 {'sectors': ['Solar'], 'mw_capacity': [-1e7], 'years': [2030], 'model_type': 'linear_regression'}):
+        response = client.post('/api/jobs/sweep', json=body)
+        assert response.status_code == 200
+        assert np.min(response.json['predicted_jobs']) == 0
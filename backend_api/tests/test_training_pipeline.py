@@ -0,0 +1,37 @@
+import joblib
+import pandas as pd
+import pytest
+
+import training_pipeline
+from mw_job_predictor import DEFAULT_DATA_PATH
+
+def test_default_data_is_the_shipped_csv():
+    assert training_pipeline.DEFAULT_DATA_PATH == DEFAULT_DATA_PATH
+    assert DEFAULT_DATA_PATH.endswith('india_jobs_data_v2.csv')
+
+def run(data_path, tmp_path):
+    return training_pipeline.run_pipeline(data_path, ['mw_regression'], 1, str(tmp_path / 'artifacts'), str(tmp_path))
+
+def test_removed_sectors_are_republished(tmp_path):
+    run(DEFAULT_DATA_PATH, tmp_path)
+    assert 'Geothermal' in joblib.load(tmp_path / 'mw_job_predictors.pkl')
+
+    data_path = tmp_path / 'jobs.csv'
+    df = pd.read_csv(DEFAULT_DATA_PATH)
+    df[df['Sector'] != 'Geothermal'].to_csv(data_path, index=False)
+    summary = run(str(data_path), tmp_path)
+    assert summary['trained'] == []
+    assert summary['dropped'] == [('mw_regression', 'Geothermal')]
+    assert 'Geothermal' not in joblib.load(tmp_path / 'mw_job_predictors.pkl')
+
+def test_failed_sector_keeps_the_others(tmp_path, monkeypatch):
+    fit = training_pipeline.TRAINERS['mw_regression']
+    def flaky(df):
+        if df['Sector'].iloc[0] == 'Solar':
+            raise RuntimeError('boom')
+        return fit(df)
+    monkeypatch.setitem(training_pipeline.TRAINERS, 'mw_regression', flaky)
+    with pytest.raises(RuntimeError):
+        run(DEFAULT_DATA_PATH, tmp_path)
+    monkeypatch.setitem(training_pipeline.TRAINERS, 'mw_regression', fit)
+    assert run(DEFAULT_DATA_PATH, tmp_path)['trained'] == [('mw_regression', 'Solar')]
@@ -0,0 +1,35 @@
+import pytest
+from flask import Flask
+
+@pytest.fixture(scope='module')
+def shard():
+    from src.routes.jobs import jobs_bp
+    app = Flask(__name__)
+    app.register_blueprint(jobs_bp, url_prefix='/api/jobs')
+    return app.test_client()
+
+@pytest.mark.parametrize('body, status', [
+    ({'sectors': 'Solar', 'from_year': 2025, 'to_year': 2030}, 400),
+    ({'sectors': [['Solar']], 'from_year': 2025, 'to_year': 2030}, 400),
+    ({'sectors': ['Nonexistent'], 'from_year': 2025, 'to_year': 2030}, 404),
+    ({'sectors': ['Solar'], 'from_year': 'soon', 'to_year': 2030}, 400),
+    ({'sectors': ['Solar'], 'from_year': 2025, 'to_year': 2030, 'installed_capacity': 'lots'}, 400),
+    ({'sectors': ['Solar'], 'from_year': 2030, 'to_year': 2025}, 400),
+])
+def test_blueprint_rejects_bad_requests(shard, body, status):
+    assert shard.post('/api/jobs/trajectory', json=body).status_code == status
+
+def test_blueprint_trajectory(shard):
+    response = shard.post('/api/jobs/trajectory', json={'sectors': ['Solar', 'Wind'], 'from_year': 2025, 'to_year': 2030})
+    assert response.status_code == 200
+    assert sorted(response.json['predictions']) == ['Solar', 'Wind']
+    assert len(response.json['predictions']['Solar']) == 6
+
+@pytest.mark.parametrize('body, status', [
+    ({'sectors': 'Solar', 'from_year': 2025, 'to_year': 2030}, 400),
+    ({'sectors': ['Nonexistent'], 'from_year': 2025, 'to_year': 2030}, 404),
+    ({'sectors': ['Solar'], 'from_year': 'soon', 'to_year': 2030}, 400),
+    ({'sectors': ['Solar'], 'from_year': 2025, 'to_year': 2300}, 400),
+])
+def test_app_rejects_bad_requests(client, body, status):
+    assert client.post('/api/jobs/trajectory', json=body).status_code == status
@@ -0,0 +1,37 @@
+import pytest
+from flask import Flask
+
+from src.models.user import db, init_db
+from src.routes.user import user_bp
+
+@pytest.fixture
+def users(tmp_path):
+    app = Flask(__name__)
+    init_db(app, str(tmp_path / 'users.db'))
+    app.register_blueprint(user_bp, url_prefix='/api')
+    yield app.test_client()
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+def seed(users, count):
+    items = [{'username': f'user{i}', 'email': f'user{i}@example.com'} for i in range(count)]
+    assert users.post('/api/users/bulk', json=items).json == {'created': count, 'updated': 0}
+
+def test_listing_is_unbounded_without_limit(users):
+    seed(users, 150)
+    assert len(users.get('/api/users').json) == 150
+    page = users.get('/api/users?limit=100')
+    assert len(page.json) == 100
+    rest = users.get(f"/api/users?limit=100&after_id={page.headers['X-Next-After-Id']}")
+    assert len(rest.json) == 50
+
+def test_bulk_upsert_unknown_and_null_ids(users):
+    seed(users, 1)
+    assert users.post('/api/users/bulk', json=[{'id': 999, 'username': 'x', 'email': 'x@example.com'}]).status_code == 404
+    response = users.post('/api/users/bulk', json=[{'id': None, 'username': 'user0', 'email': 'new@example.com'}])
+    assert response.json == {'created': 0, 'updated': 1}
+
+def test_app_does_not_register_users(client):
+    import main
+    assert 'user' not in main.app.blueprints
@@ -0,0 +1,139 @@
+import json
+import hashlib
+import numpy as np
+
+# Year x Sector aggregate cube. The data is laid out as dense (sector, year)
+# arrays and every rollup of the lattice (sector+year, sector, year, total) is
+# materialised once per dataset version. Queries slice a materialised rollup
+# and only re-aggregate the base cells when a filter changes group totals.
+MEASURES = ('actual_jobs', 'estimated_jobs', 'installed_capacity')
+DIMENSIONS = ('sector', 'year')
+
+def normalise_group_by(group_by):
+    group_by = [dim.strip() for dim in group_by if dim.strip()]
+    unknown = [dim for dim in group_by if dim not in DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown group_by dimension: {', '.join(unknown)}")
+    return tuple(dim for dim in DIMENSIONS if dim in group_by)
+
+def _divide(numerator, denominator, scale=1.0):
+    numerator = np.asarray(numerator, dtype=float)
+    denominator = np.asarray(denominator, dtype=float)
+    out = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator * scale, denominator, out=out, where=denominator != 0)
+    return out
+
+def _derive(sums, counts, group_by):
+    """Turn per-group sums and counts into the metrics a query can ask for"""
+    metrics = {'count': counts}
+    for measure in MEASURES:
+        metrics[f'{measure}_sum'] = sums[measure]
+        metrics[f'{measure}_mean'] = _divide(sums[measure], counts)
+    metrics['jobs_per_mw'] = _divide(sums['actual_jobs'], sums['installed_capacity'])
+    metrics['estimation_ratio'] = _divide(sums['estimated_jobs'], sums['actual_jobs'])
+
+    if 'year' in group_by:
+        # The year axis is always last
+        for measure in MEASURES:
+            current = sums[measure]
+            previous = np.concatenate([np.full(current.shape[:-1] + (1,), np.nan), current[..., :-1]], axis=-1)
+            metrics[f'{measure}_yoy_delta'] = current - previous
+            metrics[f'{measure}_yoy_pct'] = _divide(current - previous, previous, 100)
+
+    if 'sector' in group_by:
+        # Share of all selected sectors' jobs, within the same year if grouped by year
+        total = sums['actual_jobs'].sum(axis=0, keepdims=True)
+        metrics['actual_jobs_share_pct'] = _divide(sums['actual_jobs'], total, 100)
+    return metrics
+
+def _aggregate(cube, group_by, sector_mask, year_mask):
+    mask = cube['present'] & sector_mask[:, None] & year_mask[None, :]
+    axes = tuple(axis for axis, dim in enumerate(DIMENSIONS) if dim not in group_by)
+    sums = {measure: np.where(mask, values, 0.0).sum(axis=axes) for measure, values in cube['values'].items()}
+    counts = mask.sum(axis=axes)
+    return _derive(sums, counts, group_by)
+
+def build_cube(data):
+    """Lay out the sector data as dense arrays and materialise every rollup"""
+    sectors = list(data['sectors'])
+    years = list(data['years'])
+    sector_index = {sector: i for i, sector in enumerate(sectors)}
+    year_index = {year: j for j, year in enumerate(years)}
+
+    values = {measure: np.zeros((len(sectors), len(years))) for measure in MEASURES}
+    present = np.zeros((len(sectors), len(years)), dtype=bool)
+    for sector, sector_data in data['data'].items():
+        rows = [year_index[year] for year in sector_data['years']]
+        for measure in MEASURES:
+            values[measure][sector_index[sector], rows] = sector_data[measure]
+        present[sector_index[sector], rows] = True
+
+    cube = {
+        'version': hashlib.sha256(json.dumps(data['data'], sort_keys=True).encode()).hexdigest()[:16],
+        'sectors': sectors,
+        'years': years,
+        'sector_index': sector_index,
+        'year_index': year_index,
+        'values': values,
+        'present': present,
+        'rollups': {}
+    }
+    everything_sectors = np.ones(len(sectors), dtype=bool)
+    everything_years = np.ones(len(years), dtype=bool)
+    for group_by in ((), ('sector',), ('year',), ('sector', 'year')):
+        cube['rollups'][group_by] = _aggregate(cube, group_by, everything_sectors, everything_years)
+    return cube
+
+def _as_json_value(value):
+    value = float(value)
+    if np.isnan(value):
+        return None
+    return int(value) if value.is_integer() else round(value, 4)
+
+def query_cube(cube, group_by=(), sectors=None, years=None, metrics=None):
+    """
+    Answer a group-by query with optional sector and year filters. Returns the
+    dataset version and one row per group.
+    """
+    group_by = normalise_group_by(group_by)
+
+    unknown = [sector for sector in (sectors or []) if sector not in cube['sector_index']]
+    if unknown:
+        raise ValueError(f"Unknown sector: {', '.join(unknown)}")
+    sector_rows = [cube['sector_index'][sector] for sector in sectors] if sectors else list(range(len(cube['sectors'])))
+    year_rows = [cube['year_index'][year] for year in years if year in cube['year_index']] if years is not None else list(range(len(cube['years'])))
+
+    sector_mask = np.zeros(len(cube['sectors']), dtype=bool)
+    sector_mask[sector_rows] = True
+    year_mask = np.zeros(len(cube['years']), dtype=bool)
+    year_mask[year_rows] = True
+
+    # Filters on grouped dimensions are slices of a materialised rollup, but
+    # filtering sectors changes totals (and shares), and filtering years away
+    # changes sums, so those re-aggregate the base cells. Grouped years stay
+    # unmasked so YoY deltas still see the year before the range.
+    years_filtered = 'year' not in group_by and not year_mask.all()
+    if not sector_mask.all() or years_filtered:
+        result = _aggregate(cube, group_by, sector_mask, year_mask if years_filtered else np.ones_like(year_mask))
+    else:
+        result = cube['rollups'][group_by]
+
+    names = list(metrics) if metrics else list(result)
+    unknown = [name for name in names if name not in result]
+    if unknown:
+        raise ValueError(f"Unknown metric: {', '.join(unknown)}")
+
+    selections = []
+    if 'sector' in group_by:
+        selections.append(('sector', sector_rows, cube['sectors']))
+    if 'year' in group_by:
+        selections.append(('year', year_rows, cube['years']))
+
+    rows = []
+    for position in np.ndindex(*[len(indices) for _, indices, _ in selections]):
+        index = tuple(indices[p] for (_, indices, _), p in zip(selections, position))
+        row = {dim: labels[i] for (dim, _, labels), i in zip(selections, index)}
+        for name in names:
+            row[name] = _as_json_value(result[name][index])
+        rows.append(row)
+    return {'version': cube['version'], 'group_by': list(group_by), 'rows': rows}
@@ -1,9 +1,27 @@
 import os
 import csv
+import sys
+import json
+import hashlib
+import numpy as np
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
+sys.path.append(os.path.dirname(__file__))
+
+from uncertainty import uncertainty_summary
+from aggregates import build_cube, query_cube
+from downsampling import build_resolutions, trend_series, MIN_POINTS
+from time_index import build_time_index
+from shared_cache import cache_key, get_json, set_json
+from warmup import start_warmup, readiness, expect_ok
+from serialization import use_numpy_json
+
+# Longest year range a single trajectory request may cover
+MAX_TRAJECTORY_YEARS = 100
+
 app = Flask(__name__)
+use_numpy_json(app)
 CORS(app)
 
 # Embedded data - using the exact data from the CSV file
@@ -67,10 +85,14 @@ EMBEDDED_DATA = [
 
 # Global data storage
 SAMPLE_DATA = None
+BOOTSTRAP = None
+CUBE = None
+DOWNSAMPLED = None
+TIME_INDEX = None
 
 def load_data():
     """Load data from embedded data"""
-    global SAMPLE_DATA
+    global SAMPLE_DATA, BOOTSTRAP, CUBE, DOWNSAMPLED, TIME_INDEX
     
     data = {
         "sectors": [],
@@ -121,6 +143,10 @@ def load_data():
             sector_entry["installed_capacity"] = [sector_entry["installed_capacity"][i] for i in sorted_indices]
 
         SAMPLE_DATA = data
+        BOOTSTRAP = build_bootstrap(data)
+        CUBE = build_cube(data)
+        DOWNSAMPLED = build_resolutions(data['data'])
+        TIME_INDEX = build_time_index(data['data'])
         print(f"Data loaded successfully: {len(EMBEDDED_DATA)} records, {len(data['sectors'])} sectors")
         return True
         
@@ -155,6 +181,26 @@ def predict_jobs_from_mw(mw_capacity, sector):
     
     return max(0, predicted_jobs)
 
+def linear_extrapolation(sector_data, years):
+    """
+    Closed-form growth extrapolation from the last two actual data points,
+    evaluated for any number of target years at once
+    """
+    actual_jobs = sector_data['actual_jobs']
+    latest_year = sector_data['years'][-1]
+    latest_actual_jobs = actual_jobs[-1]
+
+    growth_rate_per_year = 0
+    if len(actual_jobs) >= 2 and actual_jobs[-2] != 0:
+        growth_rate_per_year = (latest_actual_jobs - actual_jobs[-2]) / actual_jobs[-2]
+
+    # Past or current years return the latest actual value
+    years = np.asarray(years)
+    predicted = np.where(years > latest_year,
+                         latest_actual_jobs * (1 + growth_rate_per_year * (years - latest_year)),
+                         latest_actual_jobs)
+    return predicted.astype(np.int64), latest_year, growth_rate_per_year
+
 @app.route('/')
 def health_check():
     return {'status': 'healthy', 'message': 'Renewable Energy Jobs API', 'data_loaded': SAMPLE_DATA is not None}
@@ -177,10 +223,37 @@ def get_trends():
         return {'error': 'Data not loaded'}, 500
         
     sector = request.args.get('sector')
+    max_points = request.args.get('max_points', type=int)
+    if max_points is not None and max_points < MIN_POINTS:
+        return {'error': f'max_points must be at least {MIN_POINTS}'}, 400
+    from_year = request.args.get('from_year', type=int)
+    to_year = request.args.get('to_year', type=int)
+    if from_year is not None and to_year is not None and from_year > to_year:
+        return {'error': 'from_year must not be after to_year'}, 400
     if sector and sector in SAMPLE_DATA['data']:
-        return SAMPLE_DATA['data'][sector]
+        if from_year is None and to_year is None:
+            return trend_series(SAMPLE_DATA['data'][sector], DOWNSAMPLED[sector], max_points)
+        # A range is sliced from the index and downsampled on the fly
+        return trend_series(TIME_INDEX[sector].between(from_year, to_year), {}, max_points)
     return {'error': 'Sector not found'}, 404
 
+def compute_insights(sector_data):
+    estimated_jobs = sector_data['estimated_jobs']
+    actual_jobs = sector_data['actual_jobs']
+    years = sector_data['years']
+
+    total_growth_percentage = ((actual_jobs[-1] - actual_jobs[0]) / actual_jobs[0]) * 100 if actual_jobs[0] != 0 else 0
+    average_estimation_deviation = sum([abs(e - a) for e, a in zip(estimated_jobs, actual_jobs)]) / len(estimated_jobs) if estimated_jobs else 0
+
+    return {
+        'total_growth_percentage': round(total_growth_percentage, 2),
+        'latest_jobs': actual_jobs[-1],
+        'latest_capacity': sector_data['installed_capacity'][-1],
+        'average_estimation_deviation': round(average_estimation_deviation, 2),
+        'years_of_data': len(years),
+        'latest_year': years[-1]
+    }
+
 @app.route('/api/jobs/insights')
 def get_insights():
     if not SAMPLE_DATA:
@@ -189,25 +262,59 @@ def get_insights():
     sector = request.args.get('sector')
     if sector and sector in SAMPLE_DATA['data']:
         sector_data = SAMPLE_DATA['data'][sector]
-        estimated_jobs = sector_data['estimated_jobs']
-        actual_jobs = sector_data['actual_jobs']
-        years = sector_data['years']
-
-        if not actual_jobs or len(actual_jobs) == 0:
+        if not sector_data['actual_jobs'] or len(sector_data['actual_jobs']) == 0:
             return {'error': 'No data available for sector'}, 404
+        return compute_insights(sector_data)
+    return {'error': 'Sector not found'}, 404
 
-        total_growth_percentage = ((actual_jobs[-1] - actual_jobs[0]) / actual_jobs[0]) * 100 if actual_jobs[0] != 0 else 0
-        average_estimation_deviation = sum([abs(e - a) for e, a in zip(estimated_jobs, actual_jobs)]) / len(estimated_jobs) if estimated_jobs else 0
+def build_bootstrap(data):
+    """
+    Serialise sectors, years, every trend series and every sector's insights
+    once per dataset. The version is a hash of the payload, so it changes
+    whenever the data does and doubles as the ETag.
+    """
+    payload = {
+        'sectors': data['sectors'],
+        'years': data['years'],
+        'trends': data['data'],
+        'insights': {sector: compute_insights(sector_data) for sector, sector_data in data['data'].items() if sector_data['actual_jobs']}
+    }
+    version = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:16]
+    payload['version'] = version
+    return {'version': version, 'body': json.dumps(payload, separators=(',', ':'))}
 
-        return {
-            'total_growth_percentage': round(total_growth_percentage, 2),
-            'latest_jobs': actual_jobs[-1],
-            'latest_capacity': sector_data['installed_capacity'][-1],
-            'average_estimation_deviation': round(average_estimation_deviation, 2),
-            'years_of_data': len(years),
-            'latest_year': years[-1]
-        }
-    return {'error': 'Sector not found'}, 404
+@app.route('/api/jobs/bootstrap')
+def get_bootstrap():
+    """Everything the dashboard needs for first paint in one cacheable response"""
+    if not BOOTSTRAP:
+        return {'error': 'Data not loaded'}, 500
+
+    response = app.response_class(BOOTSTRAP['body'], mimetype='application/json')
+    response.set_etag(BOOTSTRAP['version'])
+    response.cache_control.public = True
+    response.cache_control.max_age = 300
+    return response.make_conditional(request)
+
+@app.route('/api/jobs/aggregate')
+def get_aggregate():
+    """Group-by and filter queries answered from the Year x Sector rollups"""
+    if not CUBE:
+        return {'error': 'Data not loaded'}, 500
+
+    group_by = request.args.get('group_by', '').split(',')
+    sectors = request.args.getlist('sector') or None
+    years = request.args.getlist('year', type=int) or None
+    from_year = request.args.get('from_year', type=int)
+    to_year = request.args.get('to_year', type=int)
+    if from_year is not None or to_year is not None:
+        years = [y for y in (years or CUBE['years'])
+                 if (from_year is None or y >= from_year) and (to_year is None or y <= to_year)]
+    metrics = [name for name in request.args.get('metrics', '').split(',') if name] or None
+
+    try:
+        return query_cube(CUBE, group_by, sectors, years, metrics)
+    except ValueError as e:
+        return {'error': str(e)}, 400
 
 @app.route('/api/jobs/predict', methods=['POST'])
 def predict_jobs():
@@ -220,34 +327,85 @@ def predict_jobs():
 
     if sector not in SAMPLE_DATA['data']:
         return {'error': 'Sector not found'}, 404
+    samples = data.get('samples')
+    if samples is not None and (not isinstance(samples, int) or isinstance(samples, bool) or samples < 1):
+        return {'error': 'samples must be a positive integer'}, 400
+    if not isinstance(year, int) or isinstance(year, bool):
+        return {'error': 'year must be an integer'}, 400
+    # The bootstrap simulates every year up to the target, so its horizon is bounded too
+    if data.get('uncertainty') and year - SAMPLE_DATA['data'][sector]['years'][-1] > MAX_TRAJECTORY_YEARS:
+        return {'error': f'Uncertainty bands reach at most {MAX_TRAJECTORY_YEARS} years past the data'}, 400
+
+    # Responses are shared across workers and keyed on the dataset version
+    key = cache_key(sector, year, bool(data.get('uncertainty')), samples)
+    cached = get_json('predict', BOOTSTRAP['version'], key)
+    if cached is not None:
+        return cached
 
     sector_data = SAMPLE_DATA['data'][sector]
-    latest_year = max(sector_data['years'])
-    latest_actual_jobs = sector_data['actual_jobs'][sector_data['years'].index(latest_year)]
-
-    # Simple linear extrapolation for prediction
-    if latest_year < year:
-        if len(sector_data['actual_jobs']) >= 2:
-            prev_year_jobs = sector_data['actual_jobs'][-2]
-            if prev_year_jobs != 0:
-                growth_rate_per_year = (latest_actual_jobs - prev_year_jobs) / prev_year_jobs
-            else:
-                growth_rate_per_year = 0
-        else:
-            growth_rate_per_year = 0
-
-        predicted_jobs = latest_actual_jobs * (1 + growth_rate_per_year * (year - latest_year))
-    else:
-        predicted_jobs = latest_actual_jobs
+    predicted, latest_year, growth_rate_per_year = linear_extrapolation(sector_data, [year])
+    predicted_jobs = int(predicted[0])
+    if year <= latest_year:
+        growth_rate_per_year = 0
 
-    return {
+    response = {
         'sector': sector,
         'year': year,
-        'predicted_jobs': int(predicted_jobs),
-        'growth_rate': round(growth_rate_per_year * 100, 2) if 'growth_rate_per_year' in locals() else 0,
+        'predicted_jobs': predicted_jobs,
+        'growth_rate': round(growth_rate_per_year * 100, 2),
         'model_type': 'linear_extrapolation'
     }
 
+    if data.get('uncertainty'):
+        response['uncertainty'] = uncertainty_summary(sector, sector_data['actual_jobs'], year - latest_year, predicted_jobs, samples)
+    set_json('predict', BOOTSTRAP['version'], key, response)
+    return response
+
+@app.route('/api/jobs/trajectory', methods=['POST'])
+def predict_trajectory():
+    """Predict every year in a range for one or more sectors in a single call"""
+    if not SAMPLE_DATA:
+        return {'error': 'Data not loaded'}, 500
+
+    data = request.json or {}
+    sectors = data.get('sectors') or ([data['sector']] if data.get('sector') else SAMPLE_DATA['sectors'])
+
+    try:
+        from_year = int(data['from_year'])
+        to_year = int(data['to_year'])
+    except (KeyError, TypeError, ValueError):
+        return {'error': 'from_year and to_year are required'}, 400
+    if not isinstance(sectors, list) or not all(isinstance(sector, str) for sector in sectors):
+        return {'error': 'sectors must be a list of sector names'}, 400
+    if to_year < from_year or to_year - from_year >= MAX_TRAJECTORY_YEARS:
+        return {'error': f'Year range must be ascending and at most {MAX_TRAJECTORY_YEARS} years'}, 400
+
+    unknown = [sector for sector in sectors if sector not in SAMPLE_DATA['data']]
+    if unknown:
+        return {'error': f'Sector not found: {", ".join(unknown)}'}, 404
+
+    key = cache_key(sectors, from_year, to_year)
+    cached = get_json('trajectory', BOOTSTRAP['version'], key)
+    if cached is not None:
+        return cached
+
+    years = np.arange(from_year, to_year + 1)
+    predictions = {}
+    growth_rates = {}
+    for sector in sectors:
+        predicted, _, growth_rate_per_year = linear_extrapolation(SAMPLE_DATA['data'][sector], years)
+        predictions[sector] = predicted.tolist()
+        growth_rates[sector] = round(growth_rate_per_year * 100, 2)
+
+    response = {
+        'years': years.tolist(),
+        'predictions': predictions,
+        'growth_rate': growth_rates,
+        'model_type': 'linear_extrapolation'
+    }
+    set_json('trajectory', BOOTSTRAP['version'], key, response)
+    return response
+
 @app.route('/api/jobs/predict-mw', methods=['POST'])
 def predict_jobs_by_mw():
     """Predict jobs based on MW capacity for a given sector"""
@@ -279,14 +437,48 @@ def predict_jobs_by_mw():
     except Exception as e:
         return {'error': f'Prediction failed: {str(e)}'}, 500
 
+@app.route('/api/ready')
+def get_readiness():
+    """503 until the warm-up has loaded data and filled caches"""
+    return readiness()
+
+def warm_data():
+    if not SAMPLE_DATA and not load_data():
+        raise RuntimeError('Data not loaded')
+    return {'records': len(SAMPLE_DATA['raw_data']), 'sectors': len(SAMPLE_DATA['sectors'])}
+
+def warm_predictions():
+    """One prediction per sector and model, plus the cached /predict responses"""
+    client = app.test_client()
+    for sector in SAMPLE_DATA['sectors']:
+        sector_data = SAMPLE_DATA['data'][sector]
+        next_year = sector_data['years'][-1] + 1
+        for uncertainty in (False, True):
+            expect_ok(client.post('/api/jobs/predict', json={'sector': sector, 'year': next_year, 'uncertainty': uncertainty}), '/api/jobs/predict')
+        expect_ok(client.post('/api/jobs/predict-mw', json={'sector': sector, 'mw_capacity': sector_data['installed_capacity'][-1]}), '/api/jobs/predict-mw')
+    return {'sectors': len(SAMPLE_DATA['sectors'])}
+
+def warm_responses():
+    client = app.test_client()
+    for path in ('/api/jobs/bootstrap', '/api/jobs/sectors', '/api/jobs/years', '/api/jobs/aggregate'):
+        expect_ok(client.get(path), path)
+    for sector in SAMPLE_DATA['sectors']:
+        expect_ok(client.get('/api/jobs/insights', query_string={'sector': sector}), '/api/jobs/insights')
+        expect_ok(client.get('/api/jobs/trends', query_string={'sector': sector}), '/api/jobs/trends')
+    return {'sectors': len(SAMPLE_DATA['sectors'])}
+
+WARMUP_STAGES = [('data', warm_data), ('predictions', warm_predictions), ('responses', warm_responses)]
+
 if __name__ == '__main__':
     print("Starting Renewable Energy Jobs API...")
     if load_data():
         print("Data loaded successfully!")
+        start_warmup(WARMUP_STAGES)
         port = int(os.environ.get("PORT", 5000))  # Use Render/Railway's port if available
         app.run(host='0.0.0.0', port=port, debug=False)
     else:
         print("Failed to load data. Exiting.")
 
-# Load data when module is imported
+# Load data when module is imported, then warm caches before reporting ready
 load_data()
+start_warmup(WARMUP_STAGES)
@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JSON encoding for API responses that takes NumPy arrays, NumPy scalars and
+# pandas objects as they are, so handlers no longer convert every value with
+# .tolist() or int() first. With orjson installed, arrays are written straight
+# from their buffers in the same pass as the rest of the response; without
+# it, the standard library encoder is used with a hook that converts them.
+# Keys are not sorted, unlike Flask's default provider.
+ORJSON_OPTIONS = (orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+def _default(obj):
+    """Values neither encoder handles natively"""
+    if isinstance(obj, np.ndarray):
+        # orjson only takes C-contiguous arrays of plain numeric dtypes
+        if orjson and obj.dtype.kind in 'biuf' and not obj.flags.c_contiguous:
+            return np.ascontiguousarray(obj)
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if hasattr(obj, 'to_dict') and hasattr(obj, 'columns'):
+        # pandas DataFrame, as the list of records the API returns
+        return obj.to_dict('records')
+    if hasattr(obj, 'to_numpy'):
+        # pandas Series and Index
+        return _default(obj.to_numpy())
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+def dumps(obj):
+    """Encode `obj` as compact JSON bytes"""
+    if orjson:
+        return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+    return json.dumps(obj, default=_default, separators=(',', ':')).encode()
+
+class NumpyJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider used by jsonify and by handlers returning dicts or lists"""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Options such as indent= or sort_keys= go to the standard library
+            kwargs.setdefault('default', _default)
+            return super().dumps(obj, **kwargs)
+        return dumps(obj).decode()
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps(obj), mimetype=self.mimetype)
+
+def use_numpy_json(app):
+    app.json = NumpyJSONProvider(app)
+    return app
@@ -0,0 +1,199 @@
+import os
+import json
+import mmap
+import struct
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+# Host-wide cache shared by every worker process through one mmap'd file.
+# The file is a fixed-size, set-associative hash table: a key hashes to a
+# bucket of WAYS slots and, when the bucket is full, the least recently used
+# slot is overwritten. Readers take no lock; each slot carries a sequence
+# number that writers make odd while they are copying, and a reader retries
+# if it changed under it. Writers lock only the bucket they touch.
+#
+# Keys are versioned: callers pass the dataset version (e.g. BOOTSTRAP's), so
+# a data reload simply stops hitting old entries and they age out via LRU.
+#
+# The file name carries the table layout (see layout_path), so workers started
+# with a different size during a rolling reload open their own file instead of
+# resizing one that older workers still have mapped.
+CACHE_PATH = os.environ.get('SHARED_CACHE_PATH', os.path.join(tempfile.gettempdir(), f'renewable-jobs-final-cache-{os.getuid() if hasattr(os, "getuid") else 0}.bin'))
+BUCKETS = int(os.environ.get('SHARED_CACHE_BUCKETS', 512))
+WAYS = int(os.environ.get('SHARED_CACHE_WAYS', 4))
+SLOT_BYTES = int(os.environ.get('SHARED_CACHE_SLOT_BYTES', 8192))
+
+MAGIC = b'RJSC0001'
+# magic, buckets, ways, slot size, global access clock
+HEADER = struct.Struct('<8sIIIQ')
+HEADER_BYTES = 64
+# sequence, payload length, last access stamp, key digest
+SLOT_HEADER = struct.Struct('<IIQ16s')
+EMPTY_DIGEST = bytes(16)
+READ_RETRIES = 8
+
+def layout_path(path, buckets, ways, slot_bytes):
+    """cache.bin -> cache-512x4x8192.bin"""
+    root, ext = os.path.splitext(path)
+    return f'{root}-{buckets}x{ways}x{slot_bytes}{ext}'
+
+def key_digest(namespace, version, key):
+    return hashlib.blake2b(f'{namespace}\0{version}\0{key}'.encode(), digest_size=16).digest()
+
+class SharedMemoryCache:
+    def __init__(self, path=CACHE_PATH, buckets=BUCKETS, ways=WAYS, slot_bytes=SLOT_BYTES):
+        self.path = layout_path(path, buckets, ways, slot_bytes)
+        self.buckets = buckets
+        self.ways = ways
+        self.slot_bytes = slot_bytes
+        self.capacity = slot_bytes - SLOT_HEADER.size
+        self.size = HEADER_BYTES + buckets * ways * slot_bytes
+        # fcntl locks are per process, so threads of one worker also need this
+        self._thread_lock = threading.Lock()
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            self._lock_range(fd, 0, HEADER_BYTES)
+            try:
+                os.lseek(fd, 0, os.SEEK_SET)
+                header = os.read(fd, HEADER.size)
+                if not header:
+                    # New file: nobody can have it mapped yet, so sizing it is safe
+                    os.ftruncate(fd, self.size)
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    os.write(fd, HEADER.pack(MAGIC, buckets, ways, slot_bytes, 0))
+                elif (len(header) < HEADER.size or HEADER.unpack(header)[:4] != (MAGIC, buckets, ways, slot_bytes)
+                      or os.fstat(fd).st_size != self.size):
+                    # Never truncate a file that other workers may have mapped
+                    raise ValueError(f'{self.path} does not hold a {buckets}x{ways}x{slot_bytes} cache table')
+            finally:
+                self._unlock_range(fd, 0, HEADER_BYTES)
+            self.map = mmap.mmap(fd, self.size)
+        finally:
+            os.close(fd)
+        self._lock_fd = os.open(self.path, os.O_RDWR)
+
+    def _lock_range(self, fd, start, length):
+        if fcntl is not None:
+            fcntl.lockf(fd, fcntl.LOCK_EX, length, start)
+
+    def _unlock_range(self, fd, start, length):
+        if fcntl is not None:
+            fcntl.lockf(fd, fcntl.LOCK_UN, length, start)
+
+    def _bucket_offset(self, digest):
+        bucket = int.from_bytes(digest[:8], 'little') % self.buckets
+        return HEADER_BYTES + bucket * self.ways * self.slot_bytes
+
+    def _tick(self):
+        # Racy increment; an occasionally repeated stamp only blurs LRU order
+        clock = struct.unpack_from('<Q', self.map, 20)[0] + 1
+        struct.pack_into('<Q', self.map, 20, clock)
+        return clock
+
+    def get(self, namespace, version, key):
+        digest = key_digest(namespace, version, key)
+        bucket = self._bucket_offset(digest)
+        for way in range(self.ways):
+            offset = bucket + way * self.slot_bytes
+            for _ in range(READ_RETRIES):
+                sequence, length, _, slot_digest = SLOT_HEADER.unpack_from(self.map, offset)
+                if slot_digest != digest:
+                    break
+                if sequence % 2:
+                    continue
+                payload = self.map[offset + SLOT_HEADER.size:offset + SLOT_HEADER.size + length]
+                if SLOT_HEADER.unpack_from(self.map, offset)[0] == sequence:
+                    struct.pack_into('<Q', self.map, offset + 8, self._tick())
+                    return payload
+            else:
+                return None
+        return None
+
+    def set(self, namespace, version, key, value):
+        """Store bytes under a versioned key. Returns False if the value is too large."""
+        if len(value) > self.capacity:
+            return False
+        digest = key_digest(namespace, version, key)
+        bucket = self._bucket_offset(digest)
+        with self._thread_lock:
+            self._lock_range(self._lock_fd, bucket, self.ways * self.slot_bytes)
+            try:
+                slots = [(way, SLOT_HEADER.unpack_from(self.map, bucket + way * self.slot_bytes)) for way in range(self.ways)]
+                match = [way for way, (_, _, _, slot_digest) in slots if slot_digest == digest]
+                empty = [way for way, (_, _, _, slot_digest) in slots if slot_digest == EMPTY_DIGEST]
+                way = (match or empty or [min(slots, key=lambda slot: slot[1][2])[0]])[0]
+                offset = bucket + way * self.slot_bytes
+                # Always move to an odd sequence, even when a dead writer left it odd
+                sequence = slots[way][1][0]
+                writing = (sequence + 1 if sequence % 2 == 0 else sequence + 2) & 0xFFFFFFFF
+
+                struct.pack_into('<I', self.map, offset, writing)
+                self.map[offset + SLOT_HEADER.size:offset + SLOT_HEADER.size + len(value)] = value
+                SLOT_HEADER.pack_into(self.map, offset, writing, len(value), self._tick(), digest)
+                struct.pack_into('<I', self.map, offset, (writing + 1) & 0xFFFFFFFF)
+            finally:
+                self._unlock_range(self._lock_fd, bucket, self.ways * self.slot_bytes)
+        return True
+
+class LocalCache:
+    """Per-process LRU with the same interface, used when the mmap file is unavailable"""
+
+    def __init__(self, max_entries=BUCKETS * WAYS, max_value_bytes=SLOT_BYTES):
+        self.max_entries = max_entries
+        self.max_value_bytes = max_value_bytes
+        self.entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace, version, key):
+        digest = key_digest(namespace, version, key)
+        with self._lock:
+            value = self.entries.get(digest)
+            if value is not None:
+                self.entries.move_to_end(digest)
+            return value
+
+    def set(self, namespace, version, key, value):
+        if len(value) > self.max_value_bytes:
+            return False
+        digest = key_digest(namespace, version, key)
+        with self._lock:
+            self.entries[digest] = bytes(value)
+            self.entries.move_to_end(digest)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return True
+
+_cache = None
+_cache_pid = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """The cache for this process, reopened after a fork"""
+    global _cache, _cache_pid
+    with _cache_lock:
+        if _cache is None or _cache_pid != os.getpid():
+            try:
+                _cache = SharedMemoryCache()
+            except (OSError, ValueError) as e:
+                print(f"Shared cache unavailable ({e}), using a per-process cache")
+                _cache = LocalCache()
+            _cache_pid = os.getpid()
+        return _cache
+
+def cache_key(*parts):
+    return json.dumps(parts, sort_keys=True, separators=(',', ':'), default=str)
+
+def get_json(namespace, version, key):
+    value = get_cache().get(namespace, version, key)
+    return json.loads(value) if value is not None else None
+
+def set_json(namespace, version, key, obj):
+    return get_cache().set(namespace, version, key, json.dumps(obj, separators=(',', ':')).encode())
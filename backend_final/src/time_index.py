@@ -0,0 +1,40 @@
+import numpy as np
+
+# Sorted per-sector time index. Each sector's columns are stored once as NumPy
+# arrays ordered by year, so a year or a year range is found with two binary
+# searches and returned as views of those arrays rather than copies. Lookups
+# are O(log n) in the length of the series, which matters once yearly series
+# give way to monthly histories.
+
+def year_bounds(year=None, from_year=None, to_year=None):
+    """Inclusive (low, high) bounds from an exact year and/or a range; None is open"""
+    lows = [value for value in (year, from_year) if value is not None]
+    highs = [value for value in (year, to_year) if value is not None]
+    return (max(lows) if lows else None, min(highs) if highs else None)
+
+class TimeIndex:
+    """One sector's columns, sorted by `key` and sliced by binary search"""
+
+    def __init__(self, columns, key='years'):
+        order = np.argsort(np.asarray(columns[key]), kind='stable')
+        self.key = key
+        self.columns = {name: np.asarray(values)[order] for name, values in columns.items()}
+
+    def __len__(self):
+        return len(self.columns[self.key])
+
+    def span(self, low=None, high=None):
+        """The slice of rows with low <= key <= high"""
+        keys = self.columns[self.key]
+        start = 0 if low is None else int(np.searchsorted(keys, low, side='left'))
+        stop = len(keys) if high is None else int(np.searchsorted(keys, high, side='right'))
+        return slice(start, max(start, stop))
+
+    def between(self, low=None, high=None):
+        """Every column restricted to low <= key <= high, as views"""
+        rows = self.span(low, high)
+        return {name: values[rows] for name, values in self.columns.items()}
+
+def build_time_index(data, key='years'):
+    """A TimeIndex per sector from {sector: {column: values}}"""
+    return {sector: TimeIndex(series, key) for sector, series in data.items()}
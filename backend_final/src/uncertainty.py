@@ -0,0 +1,54 @@
+import os
+import zlib
+from functools import lru_cache
+import numpy as np
+
+# Monte-Carlo uncertainty bands around the growth extrapolation. Demeaned
+# year-over-year log growth residuals are resampled with replacement and
+# compounded into multiplicative deviations from the point forecast, with
+# every path simulated in a single array operation.
+DEFAULT_SAMPLES = 2000
+# Cap on simulated paths per request to bound CPU time
+MAX_SAMPLES = int(os.environ.get('MAX_UNCERTAINTY_SAMPLES', 10000))
+PERCENTILES = (5, 25, 50, 75, 95)
+
+def clamp_samples(samples):
+    if samples is None:
+        return min(DEFAULT_SAMPLES, MAX_SAMPLES)
+    return max(1, min(int(samples), MAX_SAMPLES))
+
+@lru_cache(maxsize=512)
+def simulate_bands(sector, actual_jobs, horizon, samples):
+    """
+    Percentile factors relative to the point forecast for each of the next
+    `horizon` years, as an array of shape (horizon, len(PERCENTILES)).
+    `actual_jobs` must be a tuple so the cache key also changes when the data
+    does. Returns None when the series is too short to bootstrap.
+    """
+    history = np.asarray(actual_jobs, dtype=float)
+    history = history[history > 0]
+    if horizon < 1 or len(history) < 3:
+        return None
+
+    log_growth = np.diff(np.log(history))
+    residuals = log_growth - log_growth.mean()
+
+    # Seed from the cache key so every worker returns the same bands
+    rng = np.random.default_rng(zlib.crc32(f'{sector}:{horizon}:{samples}'.encode()))
+    draws = rng.choice(residuals, size=(samples, horizon), replace=True)
+    factors = np.exp(np.cumsum(draws, axis=1))
+    bands = np.percentile(factors, PERCENTILES, axis=0).T
+    bands.setflags(write=False)
+    return bands
+
+def uncertainty_summary(sector, actual_jobs, horizon, predicted_jobs, samples=None):
+    """Bands around the final-year prediction, ready to be returned as JSON"""
+    samples = clamp_samples(samples)
+    bands = simulate_bands(sector, tuple(actual_jobs), int(horizon), samples)
+    if bands is None:
+        return None
+    return {
+        'method': 'bootstrap_log_growth',
+        'samples': samples,
+        'bands': {f'p{p}': max(0, int(predicted_jobs * factor)) for p, factor in zip(PERCENTILES, bands[-1])}
+    }
@@ -0,0 +1,86 @@
+import os
+import time
+import threading
+
+# Startup warm-up and readiness. An app registers named stages (load models,
+# run one prediction per sector, fill caches); they run once, in order, and
+# only when every stage has succeeded does readiness() report ready. The
+# liveness check stays separate so the platform does not restart a worker
+# that is still warming.
+WARMUP_IN_BACKGROUND = os.environ.get('WARMUP_IN_BACKGROUND', '1') != '0'
+
+WARMUP = {
+    'ready': False,
+    'running': False,
+    'pid': None,
+    'started_at': None,
+    'finished_at': None,
+    'total_seconds': None,
+    'stages': [],
+    'error': None
+}
+_warmup_lock = threading.Lock()
+_stages = []
+
+def expect_ok(response, what):
+    """Fail the stage when a warmed endpoint does not answer with a 2xx"""
+    if not 200 <= response.status_code < 300:
+        raise RuntimeError(f'{what} returned HTTP {response.status_code}')
+    return response
+
+def run_warmup(stages):
+    """Run (name, callable) stages in order, recording each one's duration"""
+    WARMUP.update({'ready': False, 'running': True, 'started_at': time.time(), 'finished_at': None,
+                   'total_seconds': None, 'stages': [], 'error': None})
+    started = time.perf_counter()
+    for name, stage in stages:
+        stage_started = time.perf_counter()
+        try:
+            detail = stage()
+        except Exception as e:
+            WARMUP['stages'].append({'name': name, 'status': 'failed', 'seconds': round(time.perf_counter() - stage_started, 4)})
+            WARMUP['error'] = f'{name}: {e}'
+            print(f"Warm-up stage {name} failed: {e}")
+            break
+        entry = {'name': name, 'status': 'ok', 'seconds': round(time.perf_counter() - stage_started, 4)}
+        if detail is not None:
+            entry['detail'] = detail
+        WARMUP['stages'].append(entry)
+    WARMUP['total_seconds'] = round(time.perf_counter() - started, 4)
+    WARMUP['finished_at'] = time.time()
+    WARMUP['running'] = False
+    WARMUP['ready'] = WARMUP['error'] is None
+    print(f"Warm-up {'finished' if WARMUP['ready'] else 'failed'} in {WARMUP['total_seconds']}s: "
+          + ', '.join(f"{stage['name']}={stage['seconds']}s" for stage in WARMUP['stages']))
+    return WARMUP['ready']
+
+def start_warmup(stages, background=WARMUP_IN_BACKGROUND):
+    """Start the warm-up once per process, in a daemon thread unless disabled"""
+    global _stages
+    with _warmup_lock:
+        # A warm-up inherited mid-run from a forking parent has no thread here
+        if WARMUP['pid'] == os.getpid() and (WARMUP['running'] or WARMUP['ready']):
+            return
+        WARMUP.update({'running': True, 'pid': os.getpid()})
+        _stages = list(stages)
+    if background:
+        threading.Thread(target=run_warmup, args=(stages,), name='warmup', daemon=True).start()
+    else:
+        run_warmup(stages)
+
+def _restart_after_fork():
+    """
+    A worker forked before the warm-up finished (gunicorn --preload) inherits
+    its state but not its thread, so the child runs the stages again
+    """
+    global _warmup_lock
+    _warmup_lock = threading.Lock()
+    if _stages and not WARMUP['ready']:
+        start_warmup(_stages)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+def readiness():
+    """Body and status for the readiness endpoint: 200 once warm, 503 before"""
+    return dict(WARMUP), 200 if WARMUP['ready'] else 503
@@ -90,6 +90,7 @@ function App() {
   const [trendsData, setTrendsData] = useState(null)
   const [insights, setInsights] = useState(null)
   const [prediction, setPrediction] = useState(null)
+  const [trajectory, setTrajectory] = useState(null)
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState('')
   const [activeTab, setActiveTab] = useState('overview')
@@ -98,6 +99,7 @@ function App() {
   const [mwCapacity, setMwCapacity] = useState('')
   const [mwPrediction, setMwPrediction] = useState(null)
   const [mwSelectedSector, setMwSelectedSector] = useState('')
+  const [bootstrapData, setBootstrapData] = useState(null)
 
   useEffect(() => {
     document.documentElement.classList.toggle('dark', darkMode)
@@ -116,16 +118,15 @@ function App() {
   const loadInitialData = async () => {
     try {
       setLoading(true)
-      const [sectorsResponse, yearsResponse] = await Promise.all([
-        apiService.fetchSectors(),
-        apiService.fetchYears()
-      ])
+      // One request returns sectors, years and every sector's trends and insights
+      const bootstrap = await apiService.fetchBootstrap()
+      setBootstrapData(bootstrap)
       
       // Define the desired sector order
       const sectorOrder = ['Solar', 'Wind', 'Hydroelectric', 'Geothermal', 'Biomass']
       
       // Sort sectors according to the defined order
-      const orderedSectors = sectorsResponse.sectors.sort((a, b) => {
+      const orderedSectors = [...bootstrap.sectors].sort((a, b) => {
         const indexA = sectorOrder.indexOf(a)
         const indexB = sectorOrder.indexOf(b)
         
@@ -141,7 +142,7 @@ function App() {
       })
       
       setSectors(orderedSectors)
-      setYears(yearsResponse.years)
+      setYears(bootstrap.years)
       
       // Set Solar as default if available, otherwise use first sector
       const defaultSector = orderedSectors.includes('Solar') ? 'Solar' : orderedSectors[0]
@@ -158,6 +159,13 @@ function App() {
   const loadSectorData = async () => {
     if (!selectedSector) return
     
+    // Sectors included in the bootstrap payload need no extra requests
+    if (bootstrapData?.trends?.[selectedSector] && bootstrapData?.insights?.[selectedSector]) {
+      setTrendsData(bootstrapData.trends[selectedSector])
+      setInsights(bootstrapData.insights[selectedSector])
+      return
+    }
+    
     try {
       setLoading(true)
       const [trendsResponse, insightsResponse] = await Promise.all([
@@ -178,8 +186,16 @@ function App() {
     
     try {
       setLoading(true)
-      const predictionResponse = await apiService.predictJobs(selectedSector, parseInt(selectedYear))
+      const year = parseInt(selectedYear)
+      const lastYear = trendsData?.years?.[trendsData.years.length - 1]
+      const fromYear = lastYear && lastYear < year ? lastYear + 1 : year
+      // The prediction and the year-by-year path leading up to it
+      const [predictionResponse, trajectoryResponse] = await Promise.all([
+        apiService.predictJobs(selectedSector, year),
+        apiService.predictTrajectory([selectedSector], fromYear, year)
+      ])
       setPrediction(predictionResponse)
+      setTrajectory(trajectoryResponse)
     } catch (err) {
       setError('Failed to generate prediction')
     } finally {
@@ -255,6 +271,28 @@ function App() {
     }
   }
 
+  const getTrajectoryChartData = () => {
+    if (!trajectory) return null
+    
+    return {
+      labels: trajectory.years,
+      datasets: [
+        {
+          label: 'Forecast Jobs',
+          data: Object.values(trajectory.predictions)[0] || [],
+          borderColor: sectorColors[selectedSector] || '#3b82f6',
+          backgroundColor: `${sectorColors[selectedSector] || '#3b82f6'}20`,
+          borderWidth: 3,
+          borderDash: [6, 4],
+          fill: true,
+          tension: 0.4,
+          pointRadius: 4,
+          pointHoverRadius: 6,
+        }
+      ]
+    }
+  }
+
   const getBarChartData = () => {
     if (!trendsData) return null
     
@@ -629,6 +667,11 @@ function App() {
                       Model: {prediction.model_type}
                     </Badge>
                   </div>
+                  {trajectory?.years?.length > 1 && (
+                    <div className="mt-6 h-48">
+                      <Line data={getTrajectoryChartData()} options={chartOptions} />
+                    </div>
+                  )}
                 </CardContent>
               </Card>
             </motion.div>
@@ -1,6 +1,17 @@
 const API_BASE_URL = 'https://renewable-jobs-backend.onrender.com/api/jobs';
 
 class ApiService {
+  async fetchBootstrap() {
+    try {
+      const response = await fetch(`${API_BASE_URL}/bootstrap`)
+      if (!response.ok) throw new Error('Failed to fetch dashboard data')
+      return await response.json()
+    } catch (error) {
+      console.error('Error fetching dashboard data:', error)
+      throw error
+    }
+  }
+
   async fetchSectors() {
     try {
       const response = await fetch(`${API_BASE_URL}/sectors`)
@@ -66,6 +77,27 @@ class ApiService {
     }
   }
 
+  async predictTrajectory(sectors, fromYear, toYear) {
+    try {
+      const response = await fetch(`${API_BASE_URL}/trajectory`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+        },
+        body: JSON.stringify({
+          sectors,
+          from_year: fromYear,
+          to_year: toYear,
+        }),
+      })
+      if (!response.ok) throw new Error('Failed to predict trajectory')
+      return await response.json()
+    } catch (error) {
+      console.error('Error predicting trajectory:', error)
+      throw error
+    }
+  }
+
   async predictJobsByMw(sector, mwCapacity) {
     try {
       const response = await fetch(`${API_BASE_URL}/predict-mw`, {